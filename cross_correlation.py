@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+일별 시계열 교차상관(CCF) 분석
+키워드 × 카테고리 전체 쌍의 0~N일 시차 순위 교차상관을 FFT로 한 번에 계산
+"""
+
+import numpy as np
+import pandas as pd
+from scipy.fft import rfft, irfft, next_fast_len
+from scipy.signal import find_peaks
+from scipy.stats import rankdata, t as t_dist
+
+from market_panel import MarketPanel
+
+MAX_LAG_DAYS = 120
+MIN_OVERLAP = 30
+
+# =============================================================================
+# 1. FFT 기반 순위 교차상관
+# =============================================================================
+
+def rank_cross_correlation(X, Y, max_lag=MAX_LAG_DAYS, min_overlap=MIN_OVERLAP):
+    """
+    x(t)와 y(t+lag)의 순위 상관을 모든 시차/쌍에 대해 계산
+
+    각 시계열을 전체 기간에서 한 번 순위 변환한 뒤, 시차별 겹치는 구간의
+    Pearson 상관을 구한다 (구간별 재순위 없이 Spearman에 근사).
+    곱의 합은 FFT, 구간 합/제곱합은 누적합으로 계산하므로 시차 수와 무관하게
+    O(K·C·T log T).
+
+    Args:
+        X: 선행 시계열 [K × T] (예: 키워드별 일별 검색량/기사 수)
+        Y: 후행 시계열 [C × T] (예: 카테고리별 일별 판매 지표)
+        max_lag: 최대 시차 (일)
+        min_overlap: 상관 계산에 필요한 최소 겹침 길이
+
+    Returns:
+        ndarray: [K × C × (max_lag + 1)] 상관계수 (계산 불가 시 NaN)
+    """
+    X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+    Y = np.atleast_2d(np.asarray(Y, dtype=np.float64))
+    T = X.shape[1]
+    max_lag = min(max_lag, T - 1)
+    lags = np.arange(max_lag + 1)
+    m = (T - lags).astype(np.float64)
+
+    # 순위 변환 (동순위 평균)
+    rx = rankdata(X, axis=1)
+    ry = rankdata(Y, axis=1)
+
+    # S_xy(l) = Σ_t rx[t] · ry[t + l]
+    n_fft = next_fast_len(2 * T)
+    fx = rfft(rx, n_fft, axis=1)
+    fy = rfft(ry, n_fft, axis=1)
+    s_xy = irfft(np.conj(fx)[:, None, :] * fy[None, :, :], n_fft, axis=-1)[..., :max_lag + 1]
+
+    # 겹치는 구간의 합/제곱합: x는 [0, T-l), y는 [l, T)
+    cx = np.concatenate([np.zeros((rx.shape[0], 1)), np.cumsum(rx, axis=1)], axis=1)
+    cxx = np.concatenate([np.zeros((rx.shape[0], 1)), np.cumsum(rx ** 2, axis=1)], axis=1)
+    cy = np.concatenate([np.zeros((ry.shape[0], 1)), np.cumsum(ry, axis=1)], axis=1)
+    cyy = np.concatenate([np.zeros((ry.shape[0], 1)), np.cumsum(ry ** 2, axis=1)], axis=1)
+
+    s_x = cx[:, T - lags]
+    s_xx = cxx[:, T - lags]
+    s_y = cy[:, [T]] - cy[:, lags]
+    s_yy = cyy[:, [T]] - cyy[:, lags]
+
+    cov = s_xy - s_x[:, None, :] * s_y[None, :, :] / m
+    var_x = s_xx - s_x ** 2 / m
+    var_y = s_yy - s_y ** 2 / m
+    denom = np.sqrt(np.clip(var_x[:, None, :] * var_y[None, :, :], 0, None))
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        corr = np.where(denom > 1e-12, cov / denom, np.nan)
+
+    corr[..., m < min_overlap] = np.nan
+    return np.clip(corr, -1, 1)
+
+# =============================================================================
+# 2. 시차 프로파일 피크 탐지
+# =============================================================================
+
+def lag1_autocorr(M):
+    """
+    행별 순위 변환 후 lag-1 자기상관 (유효 표본 수 보정용)
+
+    Args:
+        M: 시계열 행렬 [N × T]
+
+    Returns:
+        ndarray: [N] 자기상관 (계산 불가 시 0)
+    """
+    r = rankdata(np.atleast_2d(np.asarray(M, dtype=np.float64)), axis=1)
+    a = r[:, :-1] - r[:, :-1].mean(axis=1, keepdims=True)
+    b = r[:, 1:] - r[:, 1:].mean(axis=1, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        acf = (a * b).sum(axis=1) / np.sqrt((a ** 2).sum(axis=1) * (b ** 2).sum(axis=1))
+    return np.nan_to_num(acf, nan=0.0)
+
+
+def detect_lag_peaks(corr, T, prominence=0.05, acf_x=None, acf_y=None):
+    """
+    시차 프로파일별 최대 피크 탐지
+
+    피크는 |상관|이 가장 큰 시차이며 peak_corr는 부호를 유지한다
+    (강한 음의 반응도 피크로 잡힘).
+
+    p_nominal은 피크 시차 하나만 본 t-검정이다. p_value는 두 가지를 보정한다.
+    - 일별 시계열 자기상관: AR(1) 근사 유효 표본 수 n·(1 - ρx·ρy)/(1 + ρx·ρy)
+    - 시차 탐색: 상관이 계산된 시차 수 L로 Bonferroni 보정
+    키워드 × 카테고리 쌍 전체에 대한 다중 비교는 보정하지 않는다.
+
+    Args:
+        corr: [K × C × L] 상관계수
+        T: 원 시계열 길이 (시차별 표본 수 = T - lag)
+        prominence: 국소 피크 판정 최소 prominence (|상관| 프로파일 기준)
+        acf_x, acf_y: 선행/후행 시계열 lag-1 자기상관 [K], [C] (None이면 자기상관 보정 생략)
+
+    Returns:
+        dict: peak_lag, peak_corr, p_value, p_nominal, n_lags, lag0_corr, n_local_peaks 배열 (각 [K × C])
+    """
+    filled = np.where(np.isnan(corr), -np.inf, np.abs(corr))
+    peak_lag = np.argmax(filled, axis=-1)
+    peak_corr = np.take_along_axis(corr, peak_lag[..., None], axis=-1)[..., 0]
+    n_lags = np.sum(~np.isnan(corr), axis=-1)
+
+    # 시차별 표본 수를 반영한 양측 t-검정 (명목 / 자기상관 보정 유효 표본 수)
+    n = (T - peak_lag).astype(np.float64)
+    n_eff = n
+    if acf_x is not None and acf_y is not None:
+        rho = np.clip(np.asarray(acf_x)[:, None] * np.asarray(acf_y)[None, :], 0, 0.99)
+        n_eff = np.clip(n * (1 - rho) / (1 + rho), 3, n)
+
+    def t_test(size):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            t_stat = peak_corr * np.sqrt((size - 2) / np.clip(1 - peak_corr ** 2, 1e-12, None))
+        return 2 * t_dist.sf(np.abs(t_stat), np.clip(size - 2, 1, None))
+
+    p_nominal = t_test(n)
+    p_value = np.minimum(1.0, t_test(n_eff) * np.maximum(n_lags, 1))
+
+    # 국소 피크 수 (다중 시차 반응 여부)
+    n_local = np.zeros(corr.shape[:2], dtype=np.int32)
+    for idx in np.ndindex(corr.shape[:2]):
+        profile = np.abs(np.nan_to_num(corr[idx], nan=0.0))
+        n_local[idx] = len(find_peaks(profile, prominence=prominence)[0])
+
+    return {
+        'peak_lag': peak_lag,
+        'peak_corr': peak_corr,
+        'p_value': p_value,
+        'p_nominal': p_nominal,
+        'n_lags': n_lags,
+        'lag0_corr': corr[..., 0],
+        'n_local_peaks': n_local,
+    }
+
+# =============================================================================
+# 3. 일별 데이터프레임 → 시차 프로파일
+# =============================================================================
+
+def _daily_matrix(df, key_col, date_col, value_col, dates):
+    """long 데이터프레임을 [키 × 일자] 행렬로 정렬 (결측 일자는 0)"""
+    df = df.assign(**{date_col: pd.to_datetime(df[date_col]).dt.strftime('%Y-%m-%d')})
+    df = df.groupby([key_col, date_col], as_index=False)[value_col].sum()
+    panel = MarketPanel.from_frames([(df, {value_col: 'value'})], period_col=date_col, category_col=key_col)
+
+    per_idx = pd.Index(dates).get_indexer(panel.periods.astype(str))
+    keep = per_idx >= 0
+    mat = np.zeros((len(panel.categories), len(dates)), dtype=np.float32)
+    mat[:, per_idx[keep]] = np.nan_to_num(panel.values['value'][:, keep], nan=0.0)
+    return panel.categories, mat
+
+
+def _select_geo(df, geo, name):
+    """geo 컬럼이 있으면 한 지역만 남김 (여러 지역이 섞인 채 합산되지 않도록)"""
+    if 'geo' not in df.columns:
+        return df
+    geos = sorted(df['geo'].dropna().unique())
+    if geo is None:
+        if len(geos) > 1:
+            raise ValueError(f"{name}에 지역이 여러 개입니다 ({', '.join(geos)}). geo를 지정하세요.")
+        return df
+    if geo not in geos:
+        raise ValueError(f"{name}에 지역 {geo} 데이터가 없습니다 (있는 지역: {', '.join(geos)})")
+    return df[df['geo'] == geo]
+
+
+def analyze_lag_profiles(df_x, df_y, max_lag=MAX_LAG_DAYS, x_key='keyword', y_key='category',
+                         date_col='date', value_col='value', min_overlap=MIN_OVERLAP, geo=None):
+    """
+    키워드 × 카테고리 일별 교차상관 시차 프로파일 및 피크 분석
+
+    geo 컬럼이 있는 입력(다지역 daily_trends.csv 등)은 geo로 한 지역만 골라야 한다.
+    지역이 여러 개인데 geo를 지정하지 않으면 지역별 값이 합산되므로 오류를 낸다.
+
+    Args:
+        df_x: 선행 시계열 (date, keyword, value) — 일별 Google Trends / 뉴스 건수
+        df_y: 후행 시계열 (date, category, value) — 일별 판매 지표
+        max_lag: 최대 시차 (일)
+        x_key, y_key: 시계열 키 컬럼명
+        date_col, value_col: 일자/값 컬럼명
+        min_overlap: 최소 겹침 일수
+        geo: 분석할 지역 코드 (geo 컬럼이 있는 입력에만 적용)
+
+    Returns:
+        tuple: (프로파일 DataFrame [x_key, y_key, lag, corr], 피크 DataFrame)
+
+    Raises:
+        ValueError: geo 미지정 상태에서 입력에 지역이 여러 개일 때, 또는 지정 지역이 없을 때
+    """
+    print("\n" + "=" * 80)
+    print(f"일별 교차상관 분석 (시차 0~{max_lag}일{f', {geo}' if geo else ''})")
+    print("=" * 80)
+
+    df_x, df_y = _select_geo(df_x, geo, 'df_x'), _select_geo(df_y, geo, 'df_y')
+
+    # 두 데이터의 공통 일자 구간 (연속 달력)
+    start = max(pd.to_datetime(df_x[date_col]).min(), pd.to_datetime(df_y[date_col]).min())
+    end = min(pd.to_datetime(df_x[date_col]).max(), pd.to_datetime(df_y[date_col]).max())
+    dates = pd.date_range(start, end, freq='D').strftime('%Y-%m-%d')
+    if len(dates) <= min_overlap:
+        print(f"\n⚠️  공통 기간이 너무 짧습니다 ({len(dates)}일)")
+        return pd.DataFrame(), pd.DataFrame()
+
+    x_keys, X = _daily_matrix(df_x, x_key, date_col, value_col, dates)
+    y_keys, Y = _daily_matrix(df_y, y_key, date_col, value_col, dates)
+    print(f"  - {len(x_keys)}개 {x_key} × {len(y_keys)}개 {y_key}, {len(dates)}일")
+
+    corr = rank_cross_correlation(X, Y, max_lag=max_lag, min_overlap=min_overlap)
+    lags = np.arange(corr.shape[-1])
+    peaks = detect_lag_peaks(corr, len(dates), acf_x=lag1_autocorr(X), acf_y=lag1_autocorr(Y))
+
+    kk, cc, ll = np.meshgrid(np.arange(len(x_keys)), np.arange(len(y_keys)), lags, indexing='ij')
+    df_profiles = pd.DataFrame({
+        x_key: x_keys[kk.ravel()],
+        y_key: y_keys[cc.ravel()],
+        'lag': ll.ravel(),
+        'corr': corr.ravel().round(4),
+    })
+
+    kk, cc = np.meshgrid(np.arange(len(x_keys)), np.arange(len(y_keys)), indexing='ij')
+    df_peaks = pd.DataFrame({
+        x_key: x_keys[kk.ravel()],
+        y_key: y_keys[cc.ravel()],
+        **{name: values.ravel() for name, values in peaks.items()},
+    })
+    df_peaks['peak_corr'] = df_peaks['peak_corr'].round(4)
+    df_peaks['lag0_corr'] = df_peaks['lag0_corr'].round(4)
+    df_peaks['p_value'] = df_peaks['p_value'].round(4)
+    df_peaks['p_nominal'] = df_peaks['p_nominal'].round(4)
+    df_peaks = df_peaks.sort_values('peak_corr', key=np.abs, ascending=False).reset_index(drop=True)
+
+    print(f"\n[피크 시차 상위 10개]")
+    print(df_peaks.head(10).to_string(index=False))
+
+    return df_profiles, df_peaks
@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+로컬 대시보드 API 서버
+사전 계산된 주간 패널/상관분석/인사이트를 JSON으로 제공 (LRU 캐시 + ETag/304 + gzip)
+→ Plotly.js 기반 단일 페이지 프런트엔드, --bench로 로컬 부하 테스트
+"""
+
+import os
+import json
+import gzip
+import time
+import hashlib
+import threading
+import http.client
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs, quote
+
+import numpy as np
+import pandas as pd
+
+import market_panel
+import visualize_market_trends as vmt
+
+# =============================================================================
+# 1. 설정
+# =============================================================================
+
+HOST = '127.0.0.1'
+PORT = 8050
+OUTPUT_PREFIX = 'new_trends_crawling'
+REVIEW_SIGNALS_PATH = 'analysis/review_issues/weekly/weekly_review_signals.csv'
+
+CACHE_SIZE = 256          # 캐시할 응답 수
+RELOAD_CHECK_SEC = 5      # 입력 파일 변경 확인 간격
+GZIP_MIN_BYTES = 512      # 이보다 작은 응답은 압축하지 않음
+
+# =============================================================================
+# 2. 응답 캐시
+# =============================================================================
+
+class LRUCache:
+    """스레드 안전 LRU (요청 경로 → 인코딩된 응답)"""
+
+    def __init__(self, maxsize=CACHE_SIZE):
+        self.maxsize = maxsize
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            if key in self.items:
+                self.items.move_to_end(key)
+                self.hits += 1
+                return self.items[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self.lock:
+            self.items[key] = value
+            self.items.move_to_end(key)
+            while len(self.items) > self.maxsize:
+                self.items.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
+
+
+def encode_response(body, content_type='application/json; charset=utf-8'):
+    """본문 바이트 → (원본, gzip, ETag, Content-Type) — 캐시에 한 번만 계산해 저장"""
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    compressed = gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_BYTES else None
+    etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+    return {'body': body, 'gzip': compressed, 'etag': etag, 'content_type': content_type}
+
+
+def _to_json(obj):
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+
+def _clean(values):
+    """float 배열 → JSON 리스트 (NaN은 null)"""
+    values = np.asarray(values, dtype=np.float64)
+    return [None if np.isnan(v) else round(float(v), 4) for v in values]
+
+# =============================================================================
+# 3. 사전 계산 데이터
+# =============================================================================
+
+class DashboardSnapshot:
+    """
+    한 시점의 입력 파일로 만든 읽기 전용 데이터 묶음 (생성 후 변경하지 않음)
+
+    요청 하나는 처음 잡은 스냅샷만 사용하므로, 다시 로드 중에도 서로 다른 버전의
+    패널/상관분석이 한 응답에 섞이지 않는다.
+
+    - panel: 주간 바이럴/판매(+리뷰 신호) MarketPanel
+    - correlation: {prefix}_correlation.csv
+    - insights: {prefix}_insights.txt
+    """
+
+    def __init__(self, viral_path, sales_path, review_path, correlation_path, insights_path,
+                 version=1, signature=None):
+        review_path = review_path if review_path and os.path.exists(review_path) else None
+        self.panel = market_panel.load_market_panel(viral_path, sales_path, review_path=review_path)
+        self.common = self.panel.mask('viral_index', 'sales_score')
+        self.categories = vmt.dashboard_categories(self.panel)
+
+        self.correlation = (pd.read_csv(correlation_path, encoding='utf-8-sig')
+                            if os.path.exists(correlation_path) else pd.DataFrame())
+        insights = []
+        if os.path.exists(insights_path):
+            with open(insights_path, encoding='utf-8') as f:
+                insights = [line.rstrip('\n') for line in f]
+        self.insights = tuple(insights)
+
+        self.version = version
+        self.signature = signature
+
+    # -------------------------------------------------------------------------
+    # 엔드포인트별 본문 생성 (캐시 miss일 때만 호출)
+    # -------------------------------------------------------------------------
+
+    def categories_json(self):
+        rows = []
+        for category in self.categories:
+            weeks = self.panel.periods[self.common[self.panel.code(category)]]
+            rows.append({'category': str(category), 'n_weeks': int(len(weeks)),
+                         'first_week': str(weeks[0]) if len(weeks) else None,
+                         'last_week': str(weeks[-1]) if len(weeks) else None})
+        return _to_json({'version': self.version, 'categories': rows})
+
+    def series_json(self, category, metrics=None):
+        metrics = [m for m in (metrics or self.panel.metrics) if m in self.panel.values]
+        if not metrics:
+            raise KeyError('metrics')
+        code = self.panel.code(category)
+        observed = ~np.isnan(np.stack([self.panel.values[m][code] for m in metrics])).all(axis=0)
+        return _to_json({
+            'category': category,
+            'ymw': [str(p) for p in self.panel.periods[observed]],
+            'series': {m: _clean(self.panel.values[m][code][observed]) for m in metrics},
+        })
+
+    def figure_json(self, category):
+        merged = vmt.category_frame(self.panel, category, self.common)
+        return vmt.build_category_figure(category, merged).to_json()
+
+    def correlation_json(self, category=None):
+        df = self.correlation
+        if category and not df.empty and 'category' in df.columns:
+            df = df[df['category'] == category]
+        return df.to_json(orient='records', force_ascii=False) if not df.empty else '[]'
+
+    def insights_json(self):
+        return _to_json({'insights': list(self.insights)})
+
+
+class DashboardData:
+    """
+    서버가 제공하는 현재 스냅샷 (입력 파일이 바뀌면 새 스냅샷으로 한 번에 교체하고 캐시 무효화)
+    """
+
+    def __init__(self, viral_path=market_panel.VIRAL_PATH, sales_path=market_panel.SALES_PATH,
+                 review_path=REVIEW_SIGNALS_PATH, prefix=OUTPUT_PREFIX):
+        self.viral_path = viral_path
+        self.sales_path = sales_path
+        self.review_path = review_path
+        self.correlation_path = f'{prefix}_correlation.csv'
+        self.insights_path = f'{prefix}_insights.txt'
+        self.cache = LRUCache()
+        self.lock = threading.Lock()
+        self.snapshot = None
+        self.checked = 0.0
+        self.reload()
+
+    @property
+    def version(self):
+        return self.snapshot.version
+
+    @property
+    def categories(self):
+        return self.snapshot.categories
+
+    def _signature(self):
+        paths = [self.viral_path, self.sales_path, self.review_path, self.correlation_path, self.insights_path]
+        return tuple((os.path.getmtime(p), os.path.getsize(p)) if p and os.path.exists(p) else None
+                     for p in paths)
+
+    def reload(self):
+        # 로드 전에 지문을 떠 두면 로드 중 바뀐 파일은 다음 확인 때 다시 감지됨
+        signature = self._signature()
+        version = self.snapshot.version + 1 if self.snapshot else 1
+        snapshot = DashboardSnapshot(self.viral_path, self.sales_path, self.review_path,
+                                     self.correlation_path, self.insights_path, version, signature)
+        self.snapshot = snapshot  # 단일 대입으로 교체 (요청 스레드는 이전/새 스냅샷 중 하나만 봄)
+        self.cache.clear()
+
+    def maybe_reload(self):
+        """RELOAD_CHECK_SEC마다 입력 파일 mtime/크기를 확인해 바뀌었으면 다시 로드"""
+        now = time.monotonic()
+        if now - self.checked < RELOAD_CHECK_SEC:
+            return
+        with self.lock:
+            if now - self.checked < RELOAD_CHECK_SEC:
+                return
+            self.checked = now
+            if self._signature() != self.snapshot.signature:
+                print("입력 파일 변경 감지 → 데이터 다시 로드")
+                try:
+                    self.reload()
+                except Exception as e:
+                    # 쓰는 중인 파일 등: 이전 스냅샷으로 계속 응답하고 다음 확인 때 재시도
+                    print(f"⚠️  다시 로드 실패, 이전 데이터 유지: {str(e)[:80]}")
+
+# =============================================================================
+# 4. HTTP 핸들러
+# =============================================================================
+
+INDEX_HTML = """<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="utf-8">
+<title>뉴스 vs 판매량 추이 대시보드</title>
+<script src="/static/plotly.min.js"></script>
+<style>
+  body { background:#111; color:#ddd; font-family:sans-serif; margin:20px; }
+  select { font-size:15px; padding:4px; }
+  table { border-collapse:collapse; font-size:13px; margin-top:12px; }
+  td, th { border:1px solid #444; padding:4px 8px; }
+  pre { white-space:pre-wrap; font-size:13px; }
+</style>
+</head>
+<body>
+<h2>카테고리별 뉴스 vs 판매량 추이</h2>
+<select id="category"></select>
+<div id="chart" style="height:560px"></div>
+<h3>상관분석</h3>
+<table id="correlation"></table>
+<h3>인사이트</h3>
+<pre id="insights"></pre>
+<script>
+const get = (url) => fetch(url).then(r => r.json());
+const sel = document.getElementById('category');
+
+function renderTable(rows) {
+  const table = document.getElementById('correlation');
+  if (!rows.length) { table.innerHTML = '<tr><td>상관분석 결과 없음</td></tr>'; return; }
+  const cols = Object.keys(rows[0]);
+  table.innerHTML = '<tr>' + cols.map(c => '<th>' + c + '</th>').join('') + '</tr>' +
+    rows.map(r => '<tr>' + cols.map(c => '<td>' + (r[c] ?? '') + '</td>').join('') + '</tr>').join('');
+}
+
+async function show(category) {
+  const q = encodeURIComponent(category);
+  const [fig, corr] = await Promise.all([get('/api/figure?category=' + q), get('/api/correlation?category=' + q)]);
+  Plotly.react('chart', fig.data, fig.layout, {responsive: true});
+  renderTable(corr);
+}
+
+get('/api/categories').then(res => {
+  res.categories.forEach(c => sel.add(new Option(c.category + ' (' + c.n_weeks + '주)', c.category)));
+  sel.onchange = () => show(sel.value);
+  if (res.categories.length) show(res.categories[0].category);
+});
+get('/api/insights').then(res => { document.getElementById('insights').textContent = res.insights.join('\\n'); });
+</script>
+</body>
+</html>
+"""
+
+
+class DashboardHandler(BaseHTTPRequestHandler):
+    """GET 전용 핸들러 (응답은 경로+쿼리 단위로 LRU 캐시)"""
+
+    protocol_version = 'HTTP/1.1'   # keep-alive
+    disable_nagle_algorithm = True  # 헤더/본문 분할 전송 시 지연(ACK 대기) 방지
+    data = None                     # make_server에서 DashboardData 주입
+
+    def do_GET(self):
+        self.data.maybe_reload()
+        snapshot = self.data.snapshot
+        key = (snapshot.version, self.path)
+        cached = self.data.cache.get(key)
+        if cached is None:
+            try:
+                cached = self._build(urlsplit(self.path), snapshot)
+            except KeyError as e:
+                return self._send_error(404, f'알 수 없는 카테고리/지표: {e}')
+            except Exception as e:
+                print(f"❌ {self.path} 처리 오류: {type(e).__name__}: {str(e)[:80]}")
+                return self._send_error(500, f'서버 오류: {type(e).__name__}')
+            if cached is None:
+                return self._send_error(404, f'알 수 없는 경로: {urlsplit(self.path).path}')
+            self.data.cache.put(key, cached)
+        self._send(cached)
+
+    def _build(self, url, snapshot):
+        query = parse_qs(url.query)
+        category = query.get('category', [None])[0]
+
+        if url.path in ('/', '/index.html'):
+            return encode_response(INDEX_HTML, 'text/html; charset=utf-8')
+        if url.path == '/static/plotly.min.js':
+            from plotly.offline import get_plotlyjs
+            return encode_response(get_plotlyjs(), 'application/javascript; charset=utf-8')
+        if url.path == '/api/categories':
+            return encode_response(snapshot.categories_json())
+        if url.path == '/api/series':
+            metrics = query['metrics'][0].split(',') if 'metrics' in query else None
+            return encode_response(snapshot.series_json(category, metrics))
+        if url.path == '/api/figure':
+            return encode_response(snapshot.figure_json(category))
+        if url.path == '/api/correlation':
+            return encode_response(snapshot.correlation_json(category))
+        if url.path == '/api/insights':
+            return encode_response(snapshot.insights_json())
+        return None
+
+    def _send(self, cached):
+        # 클라이언트가 같은 버전을 가지고 있으면 본문 없이 304
+        if self.headers.get('If-None-Match') == cached['etag']:
+            self.send_response(304)
+            self.send_header('ETag', cached['etag'])
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        use_gzip = cached['gzip'] is not None and 'gzip' in self.headers.get('Accept-Encoding', '')
+        body = cached['gzip'] if use_gzip else cached['body']
+        self.send_response(200)
+        self.send_header('Content-Type', cached['content_type'])
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', cached['etag'])
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Vary', 'Accept-Encoding')
+        if use_gzip:
+            self.send_header('Content-Encoding', 'gzip')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status, message):
+        body = _to_json({'error': message}).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(data, host=HOST, port=PORT):
+    """DashboardData를 제공하는 ThreadingHTTPServer 생성 (port=0이면 빈 포트)"""
+    handler = type('Handler', (DashboardHandler,), {'data': data})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def serve(data=None, host=HOST, port=PORT):
+    """대시보드 서버 실행 (Ctrl+C로 종료)"""
+    data = data or DashboardData()
+    server = make_server(data, host, port)
+    print(f"대시보드 서버: http://{host}:{server.server_address[1]}/ "
+          f"(카테고리 {len(data.categories)}개, Ctrl+C로 종료)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n서버 종료")
+    finally:
+        server.server_close()
+
+# =============================================================================
+# 5. 로컬 부하 테스트
+# =============================================================================
+
+def run_bench(data=None, requests=2000, concurrency=32, revalidate=0.5):
+    """
+    임시 포트에 서버를 띄우고 동시 뷰어를 흉내 내 처리량/지연 측정
+
+    각 워커는 keep-alive 연결 하나로 카테고리/시리즈/그림/상관분석 엔드포인트를 돌아가며
+    요청하고, revalidate 비율만큼은 직전에 받은 ETag로 If-None-Match 요청을 보낸다.
+
+    Args:
+        data: DashboardData (None이면 기본 경로로 로드)
+        requests: 전체 요청 수
+        concurrency: 동시 연결(뷰어) 수
+        revalidate: ETag 재검증 요청 비율 (0~1)
+
+    Returns:
+        dict: requests, seconds, rps, p50_ms, p95_ms, not_modified, cache_hit_rate
+    """
+    data = data or DashboardData()
+    server = make_server(data, HOST, 0)
+    port = server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    paths = ['/api/categories', '/api/insights']
+    for category in data.categories:
+        q = quote(str(category))
+        paths += [f'/api/series?category={q}', f'/api/figure?category={q}', f'/api/correlation?category={q}']
+
+    def worker(n):
+        conn = http.client.HTTPConnection(HOST, port)
+        rng = np.random.default_rng(n)
+        etags, latencies, not_modified = {}, [], 0
+        for i in range(requests // concurrency):
+            path = paths[(n + i) % len(paths)]
+            headers = {'Accept-Encoding': 'gzip'}
+            if path in etags and rng.random() < revalidate:
+                headers['If-None-Match'] = etags[path]
+            started = time.perf_counter()
+            conn.request('GET', path, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            latencies.append(time.perf_counter() - started)
+            etags[path] = response.getheader('ETag')
+            not_modified += response.status == 304
+        conn.close()
+        return latencies, not_modified
+
+    print("\n" + "=" * 80)
+    print(f"대시보드 서버 부하 테스트 (요청 {requests}회, 동시 {concurrency})")
+    print("=" * 80)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(worker, range(concurrency)))
+    elapsed = time.perf_counter() - started
+    server.shutdown()
+    server.server_close()
+
+    latencies = np.concatenate([np.asarray(lat) for lat, _ in results]) * 1000
+    total = len(latencies)
+    cache = data.cache
+    summary = {
+        'requests': total,
+        'seconds': round(elapsed, 2),
+        'rps': round(total / elapsed, 1),
+        'p50_ms': round(float(np.percentile(latencies, 50)), 2),
+        'p95_ms': round(float(np.percentile(latencies, 95)), 2),
+        'not_modified': int(sum(nm for _, nm in results)),
+        'cache_hit_rate': round(cache.hits / max(1, cache.hits + cache.misses), 3),
+    }
+    for key, value in summary.items():
+        print(f"  {key}: {value}")
+    return summary
+
+
+if __name__ == "__main__":
+    serve()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+바이럴 급등 이벤트 스터디
+카테고리별 viral_index 급등 시점 탐지 → 이벤트 전후 sales_score 윈도우 정렬(strided view)
+→ 이벤트 전 기준선 대비 초과 반응(AR) 및 누적 초과 반응(CAR) 평균 ± 신뢰구간
+"""
+
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.stats import t as t_dist
+
+from market_panel import load_market_panel, VIRAL_PATH, SALES_PATH
+
+# =============================================================================
+# 1. 설정
+# =============================================================================
+
+EVENT_DIR = 'analysis/event_study'
+PRE_WEEKS = 4       # 기준선 구간 (이벤트 직전 N주)
+POST_WEEKS = 8      # 반응 관찰 구간 (이벤트 후 N주)
+Z_THRESHOLD = 2.0
+CONFIDENCE = 0.95
+
+# =============================================================================
+# 2. 이벤트 탐지
+# =============================================================================
+
+def detect_events(panel, method='zscore', threshold=Z_THRESHOLD, metric='viral_index',
+                  z_metric='viral_index_smoothed', min_gap=None):
+    """
+    카테고리별 급등 이벤트(임계값 상향 돌파 시점) 탐지
+
+    Args:
+        panel: MarketPanel
+        method: 'zscore' (z_metric의 카테고리별 z-점수) 또는 'threshold' (metric 원값)
+        threshold: 돌파 기준 (z-점수 또는 지수 값)
+        metric: threshold 방식에서 사용할 지표
+        z_metric: zscore 방식에서 사용할 지표
+        min_gap: 같은 카테고리에서 마지막으로 채택된 이벤트와의 최소 간격 (기간 수, None이면 제한 없음)
+
+    Returns:
+        tuple: (카테고리 코드 배열, 기간 인덱스 배열, 이벤트 시점 점수 배열)
+    """
+    if method == 'zscore':
+        arr = panel.values[z_metric].astype(np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            score = (arr - np.nanmean(arr, axis=1, keepdims=True)) / np.nanstd(arr, axis=1, keepdims=True)
+    elif method == 'threshold':
+        score = panel.values[metric].astype(np.float64)
+    else:
+        raise ValueError(f"지원하지 않는 탐지 방식: {method}")
+
+    above = score >= threshold
+    prev_above = np.zeros_like(above)
+    prev_above[:, 1:] = above[:, :-1]
+    cat_idx, t_idx = np.nonzero(above & ~prev_above)
+
+    if min_gap and len(t_idx):
+        # 같은 카테고리에서 마지막으로 채택된 이벤트와의 간격 기준 (버려진 돌파 시점은 기준이 되지 않음)
+        # np.nonzero는 (카테고리, 기간) 순으로 정렬되어 있음
+        keep = np.zeros(len(t_idx), dtype=bool)
+        last_cat, last_t = -1, 0
+        for i, (c, t) in enumerate(zip(cat_idx, t_idx)):
+            if c != last_cat or t - last_t >= min_gap:
+                keep[i] = True
+                last_cat, last_t = c, t
+        cat_idx, t_idx = cat_idx[keep], t_idx[keep]
+
+    return cat_idx, t_idx, score[cat_idx, t_idx]
+
+# =============================================================================
+# 3. 이벤트 윈도우 추출 및 초과 반응
+# =============================================================================
+
+def extract_windows(arr, cat_idx, t_idx, pre=PRE_WEEKS, post=POST_WEEKS):
+    """
+    이벤트별 [t - pre, t + post] 구간을 한 번의 인덱싱으로 추출
+
+    시계열 양끝을 NaN으로 패딩한 뒤 sliding_window_view로 모든 시점의 윈도우를
+    복사 없이 만들고, (카테고리, 시점) 팬시 인덱싱으로 이벤트 윈도우만 모은다.
+
+    Args:
+        arr: 지표 배열 [카테고리 × 기간]
+        cat_idx, t_idx: 이벤트 카테고리 코드/기간 인덱스
+        pre, post: 이벤트 전/후 기간 수
+
+    Returns:
+        ndarray: [이벤트 × (pre + 1 + post)], 열 pre가 이벤트 시점
+    """
+    padded = np.pad(arr.astype(np.float64), ((0, 0), (pre, post)), constant_values=np.nan)
+    windows = sliding_window_view(padded, pre + 1 + post, axis=1)  # [카테고리 × 기간 × 윈도우]
+    return windows[cat_idx, t_idx]
+
+
+def abnormal_response(windows, pre=PRE_WEEKS):
+    """
+    이벤트 전 기준선 대비 초과 반응(AR)과 이벤트 시점부터의 누적 초과 반응(CAR)
+
+    Args:
+        windows: extract_windows 결과 [이벤트 × (pre + 1 + post)]
+        pre: 기준선 구간 길이 (윈도우 앞 pre개 열)
+
+    Returns:
+        tuple: (AR [이벤트 × 윈도우], CAR [이벤트 × 윈도우], 기준선 [이벤트])
+               CAR은 이벤트 이전 열이 NaN, 이후 결측이 있으면 그 시점부터 NaN
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # 기준선 구간 전체 결측 → NaN
+        baseline = np.nanmean(windows[:, :pre], axis=1) if pre > 0 else np.zeros(len(windows))
+    ar = windows - baseline[:, None]
+    car = np.full_like(ar, np.nan)
+    car[:, pre:] = np.cumsum(ar[:, pre:], axis=1)
+    return ar, car, baseline
+
+
+def mean_with_band(x, confidence=CONFIDENCE):
+    """
+    열별 평균과 t-분포 기반 신뢰구간 (NaN 제외)
+
+    Returns:
+        tuple: (평균, 하한, 상한, 표본 수) 배열
+    """
+    n = np.sum(~np.isnan(x), axis=0)
+    with warnings.catch_warnings(), np.errstate(invalid='ignore', divide='ignore'):
+        warnings.simplefilter('ignore', RuntimeWarning)
+        mean = np.nanmean(x, axis=0) if len(x) else np.full(x.shape[1], np.nan)
+        std = np.nanstd(x, axis=0, ddof=1) if len(x) > 1 else np.full(x.shape[1], np.nan)
+        half = t_dist.ppf(0.5 + confidence / 2, np.clip(n - 1, 1, None)) * std / np.sqrt(n)
+    half = np.where(n > 1, half, np.nan)
+    return mean, mean - half, mean + half, n
+
+# =============================================================================
+# 4. 이벤트 스터디 실행
+# =============================================================================
+
+def run_event_study(panel=None, method='zscore', threshold=Z_THRESHOLD, pre=PRE_WEEKS, post=POST_WEEKS,
+                    response_metric='sales_score', min_gap=None, confidence=CONFIDENCE, out_dir=EVENT_DIR):
+    """
+    바이럴 급등 이벤트 → 판매 점수 반응 이벤트 스터디
+
+    Args:
+        panel: MarketPanel (None이면 load_market_panel())
+        method: 'zscore' 또는 'threshold'
+        threshold: 이벤트 기준
+        pre, post: 기준선/관찰 구간 (기간 수)
+        response_metric: 반응 지표 (sales_score, review_velocity 등)
+        min_gap: 같은 카테고리 이벤트 최소 간격
+        confidence: 신뢰수준
+        out_dir: 결과 저장 디렉토리 (None이면 저장 안 함)
+
+    Returns:
+        dict: events(이벤트 목록), profile(상대 시점별 평균 AR/CAR ± 신뢰구간),
+              by_category(카테고리별 최종 CAR)
+    """
+    print("\n" + "=" * 80)
+    print(f"바이럴 급등 이벤트 스터디 ({method} ≥ {threshold:g}, 전 {pre} / 후 {post})")
+    print("=" * 80)
+
+    panel = panel if panel is not None else load_market_panel()
+    cat_idx, t_idx, score = detect_events(panel, method, threshold, min_gap=min_gap)
+    print(f"\n탐지된 이벤트: {len(t_idx)}건 ({len(np.unique(cat_idx))}개 카테고리)")
+    if not len(t_idx):
+        print("⚠️  이벤트가 없습니다. threshold를 낮춰 보세요.")
+        return {'events': pd.DataFrame(), 'profile': pd.DataFrame(), 'by_category': pd.DataFrame()}
+
+    windows = extract_windows(panel.values[response_metric], cat_idx, t_idx, pre, post)
+    ar, car, baseline = abnormal_response(windows, pre)
+    final_car = car[:, -1]
+
+    df_events = pd.DataFrame({
+        'category': panel.categories[cat_idx],
+        'period': panel.periods[t_idx],
+        'score': score.round(3),
+        'baseline': baseline.round(3),
+        f'car_{post}': final_car.round(3),
+    })
+
+    rel = np.arange(-pre, post + 1)
+    ar_mean, ar_lo, ar_hi, n_ar = mean_with_band(ar, confidence)
+    car_mean, car_lo, car_hi, n_car = mean_with_band(car, confidence)
+    df_profile = pd.DataFrame({
+        'rel_period': rel, 'n_events': n_ar,
+        'mean_ar': ar_mean, 'ar_low': ar_lo, 'ar_high': ar_hi,
+        'n_car': n_car, 'mean_car': car_mean, 'car_low': car_lo, 'car_high': car_hi,
+    }).round(4)
+
+    # 카테고리별 최종 CAR 평균 ± 신뢰구간 (카테고리 코드 순 정렬 후 구간별 집계)
+    rows = []
+    order = np.argsort(cat_idx, kind='stable')
+    bounds = np.flatnonzero(np.r_[True, np.diff(cat_idx[order]) != 0, True])
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        mean, low, high, n = mean_with_band(final_car[order[lo:hi], None], confidence)
+        rows.append({'category': panel.categories[cat_idx[order[lo]]], 'n_events': hi - lo,
+                     'n_complete': int(n[0]), 'mean_car': mean[0], 'car_low': low[0], 'car_high': high[0]})
+    df_category = pd.DataFrame(rows).round(4).sort_values('mean_car', ascending=False)
+
+    print(f"\n[상대 시점별 평균 초과 반응 ({confidence:.0%} 신뢰구간)]")
+    print(df_profile.to_string(index=False))
+    print(f"\n[카테고리별 {post}기간 누적 초과 반응]")
+    print(df_category.to_string(index=False))
+
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+        df_events.to_csv(os.path.join(out_dir, 'viral_spike_events.csv'), index=False, encoding='utf-8-sig')
+        df_profile.to_csv(os.path.join(out_dir, 'event_response_profile.csv'), index=False, encoding='utf-8-sig')
+        df_category.to_csv(os.path.join(out_dir, 'event_response_by_category.csv'), index=False, encoding='utf-8-sig')
+        print(f"\n✓ 저장: {out_dir}")
+
+    return {'events': df_events, 'profile': df_profile, 'by_category': df_category}
+
+
+if __name__ == "__main__":
+    run_event_study(load_market_panel(VIRAL_PATH, SALES_PATH))
@@ -16,9 +16,17 @@ if sys.platform == 'win32':
 
 
 class EconomyTrendsAnalyzer:
-    def __init__(self):
-        """경제 트렌드 분석기 초기화"""
+    def __init__(self, geo: str = 'KR', sleep_scale: float = 1.0):
+        """
+        경제 트렌드 분석기 초기화 (geo: 지역 코드, sleep_scale: 요청 간 대기 배율)
+
+        키워드마다 build_payload + related_queries로 2회 요청한 뒤 uniform(1.5, 2.5) × sleep_scale초 대기하므로,
+        실제 간격은 평균 2 × sleep_scale보다 최대 25% 짧을 수 있다. 요청 예산을 지키려면
+        sleep_scale = 계획 간격 / 1.5로 둔다 (shard_runner.run_shard 참고).
+        """
         self.pytrends = TrendReq(hl='ko', tz=540)  # 한국어, 한국 시간대
+        self.geo = geo
+        self.sleep_scale = sleep_scale
 
     def get_economy_trends_by_month(self, year: int, month: int, top_n: int = 30) -> List[Dict]:
         """
@@ -87,7 +95,7 @@ class EconomyTrendsAnalyzer:
                         [keyword],
                         cat=7,  # 비즈니스 카테고리
                         timeframe=timeframe,
-                        geo='KR'
+                        geo=self.geo
                     )
 
                     # 관련 검색어 (rising - 급상승 검색어 우선)
@@ -139,7 +147,7 @@ class EconomyTrendsAnalyzer:
                         pass
 
                     # Rate limit 방지
-                    time.sleep(random.uniform(1.5, 2.5))
+                    time.sleep(random.uniform(1.5, 2.5) * self.sleep_scale)
 
                 except Exception as e:
                     print(f"    ⚠️ '{keyword}' 처리 실패: {e}")
@@ -211,7 +219,7 @@ class EconomyTrendsAnalyzer:
             # 월별로 대기
             if month < current_month:
                 print(f"\n⏳ 다음 월 수집을 위해 잠시 대기 중...")
-                time.sleep(random.uniform(5, 10))
+                time.sleep(random.uniform(5, 10) * self.sleep_scale)
 
         return results
 
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+카테고리 × 기간 패널 데이터 구조
+상관분석/시각화 단계가 공유하는 정렬된 NumPy 패널 (float32, 정수 기간 인덱스)
+"""
+
+import numpy as np
+import pandas as pd
+
+# 주간 바이럴 지수 / 베스트셀러 판매 점수 (ymw, category 기준)
+VIRAL_PATH = 'analysis/viral_index/weekly_news_viral_index_revised.csv'
+SALES_PATH = 'analysis/viral_index/weekly_bestseller_scores_decay.csv'
+
+# =============================================================================
+# 1. 패널 클래스
+# =============================================================================
+
+class MarketPanel:
+    """
+    카테고리 × 기간으로 정렬된 지표 패널
+
+    - categories: 카테고리 코드 테이블 (코드 i → categories[i])
+    - periods: 정렬된 기간 라벨 (정수 인덱스 t → periods[t])
+    - values: 지표명 → float32 배열 [카테고리 × 기간], 결측은 NaN
+    """
+
+    def __init__(self, categories, periods, values):
+        self.categories = np.asarray(categories, dtype=object)
+        self.periods = np.asarray(periods, dtype=object)
+        self.values = values
+        self._category_codes = {cat: i for i, cat in enumerate(self.categories)}
+
+    # -------------------------------------------------------------------------
+    # 생성
+    # -------------------------------------------------------------------------
+
+    @classmethod
+    def from_frames(cls, frames, period_col='ymw', category_col='category'):
+        """
+        long 포맷 데이터프레임들을 한 번에 정렬하여 패널 생성
+
+        Args:
+            frames: (DataFrame, 지표 컬럼 리스트 또는 {원본 컬럼: 지표명}) 튜플 리스트
+            period_col: 기간 컬럼명 (ymw, month, date 등)
+            category_col: 카테고리 컬럼명
+
+        Returns:
+            MarketPanel: 모든 프레임의 카테고리/기간 합집합으로 정렬된 패널
+        """
+        frames = [(df, _metric_mapping(cols)) for df, cols in frames]
+
+        # 카테고리/기간 코드 테이블은 합집합 기준으로 한 번만 생성
+        all_categories = pd.concat([df[category_col].astype(str) for df, _ in frames], ignore_index=True)
+        all_periods = pd.concat([df[period_col].astype(str) for df, _ in frames], ignore_index=True)
+        categories = np.sort(all_categories.unique())
+        periods = np.sort(all_periods.unique())
+
+        values = {}
+        for df, mapping in frames:
+            cat_idx = pd.Index(categories).get_indexer(df[category_col].astype(str))
+            per_idx = pd.Index(periods).get_indexer(df[period_col].astype(str))
+
+            for src_col, metric in mapping.items():
+                arr = np.full((len(categories), len(periods)), np.nan, dtype=np.float32)
+                # 동일 (카테고리, 기간) 중복 행은 마지막 값이 남음
+                arr[cat_idx, per_idx] = pd.to_numeric(df[src_col], errors='coerce').to_numpy(dtype=np.float32)
+                values[metric] = arr
+
+        return cls(categories, periods, values)
+
+    @classmethod
+    def from_wide(cls, df_wide, metric):
+        """
+        기간 × 카테고리 wide 테이블(예: 월별 점유율)로 단일 지표 패널 생성
+
+        Args:
+            df_wide: index=기간, columns=카테고리 데이터프레임
+            metric: 지표명
+
+        Returns:
+            MarketPanel
+        """
+        df_wide = df_wide.sort_index().sort_index(axis=1)
+        values = {metric: df_wide.to_numpy(dtype=np.float32).T.copy()}
+        return cls(df_wide.columns.astype(str), df_wide.index.astype(str), values)
+
+    def join(self, other):
+        """
+        다른 패널과 카테고리/기간 합집합 기준으로 결합 (생성 단계에서 한 번만 호출)
+
+        Args:
+            other: MarketPanel
+
+        Returns:
+            MarketPanel: 두 패널의 지표를 모두 가진 새 패널
+        """
+        categories = np.union1d(self.categories.astype(str), other.categories.astype(str))
+        periods = np.union1d(self.periods.astype(str), other.periods.astype(str))
+
+        values = {}
+        for panel in (self, other):
+            cat_idx = pd.Index(categories).get_indexer(panel.categories.astype(str))
+            per_idx = pd.Index(periods).get_indexer(panel.periods.astype(str))
+            for metric, arr in panel.values.items():
+                out = np.full((len(categories), len(periods)), np.nan, dtype=np.float32)
+                out[np.ix_(cat_idx, per_idx)] = arr
+                values[metric] = out
+
+        return MarketPanel(categories, periods, values)
+
+    # -------------------------------------------------------------------------
+    # 조회 (모두 복사 없는 view 반환)
+    # -------------------------------------------------------------------------
+
+    @property
+    def period_index(self):
+        """정수 기간 인덱스 (0 … T-1)"""
+        return np.arange(len(self.periods), dtype=np.int32)
+
+    @property
+    def metrics(self):
+        return list(self.values)
+
+    @property
+    def nbytes(self):
+        return sum(arr.nbytes for arr in self.values.values())
+
+    def code(self, category):
+        """카테고리명 → 정수 코드 (없으면 KeyError)"""
+        return self._category_codes[category]
+
+    def has_category(self, category):
+        return category in self._category_codes
+
+    def series(self, metric, category):
+        """단일 카테고리의 기간별 값 (1차원 view)"""
+        return self.values[metric][self.code(category)]
+
+    def mask(self, *metrics):
+        """지정 지표들이 모두 관측된 셀의 bool 마스크 [카테고리 × 기간]"""
+        valid = np.ones((len(self.categories), len(self.periods)), dtype=bool)
+        for metric in metrics:
+            valid &= ~np.isnan(self.values[metric])
+        return valid
+
+    def lagged(self, x_metric, y_metric, lag):
+        """
+        x(t)와 y(t+lag)를 맞춘 view 쌍
+
+        Args:
+            x_metric: 선행 지표명 (예: viral_index)
+            y_metric: 후행 지표명 (예: sales_score)
+            lag: 기간 단위 시차 (0 이상)
+
+        Returns:
+            tuple: (x view, y view), 각 [카테고리 × (T - lag)]
+        """
+        x = self.values[x_metric]
+        y = self.values[y_metric]
+        n = len(self.periods) - lag
+        return x[:, :n], y[:, lag:lag + n]
+
+    def slice_periods(self, start=None, stop=None):
+        """
+        기간 라벨 구간 [start, stop]으로 자른 패널 (지표 배열은 view 공유)
+
+        Args:
+            start: 시작 기간 라벨 (포함, None이면 처음부터)
+            stop: 종료 기간 라벨 (포함, None이면 끝까지)
+
+        Returns:
+            MarketPanel
+        """
+        lo = 0 if start is None else int(np.searchsorted(self.periods.astype(str), str(start), side='left'))
+        hi = len(self.periods) if stop is None else int(np.searchsorted(self.periods.astype(str), str(stop), side='right'))
+        values = {metric: arr[:, lo:hi] for metric, arr in self.values.items()}
+        return MarketPanel(self.categories, self.periods[lo:hi], values)
+
+    def to_frame(self, category, *metrics):
+        """단일 카테고리를 기간 × 지표 데이터프레임으로 변환 (출력/시각화용)"""
+        metrics = metrics or tuple(self.values)
+        code = self.code(category)
+        return pd.DataFrame(
+            {metric: self.values[metric][code] for metric in metrics},
+            index=pd.Index(self.periods, name='period')
+        )
+
+    def __repr__(self):
+        return (f"MarketPanel({len(self.categories)} categories × {len(self.periods)} periods, "
+                f"metrics={self.metrics}, {self.nbytes / 1024:.1f} KiB)")
+
+
+def _metric_mapping(cols):
+    if isinstance(cols, dict):
+        return dict(cols)
+    return {col: col for col in cols}
+
+# =============================================================================
+# 2. 입력 파일 → 패널
+# =============================================================================
+
+# 주간 CSV의 ymw 라벨 형식 (판매 CSV 라벨에서 감지, 리뷰 등 외부 일자 데이터를 같은 라벨로 매핑)
+#   month_week:   YYYY-MM-W   월 내 일자 기준 주차 (1~7일 → 1주차, 29일~ → 5주차)
+#   month_week_w: YYYY-MM-Wn  month_week와 같은 주차, 'W' 접두 표기
+#   iso_week:     YYYY-Www    ISO 주차 (월요일 시작)
+YMW_FORMATS = {
+    'month_week': r'^\d{4}-\d{2}-[1-5]$',
+    'month_week_w': r'^\d{4}-\d{2}-W[1-5]$',
+    'iso_week': r'^\d{4}-W\d{2}$',
+}
+DEFAULT_YMW_FORMAT = 'month_week'
+
+
+def detect_ymw_format(labels):
+    """
+    기존 ymw 라벨에서 형식 감지
+
+    Args:
+        labels: ymw 라벨 Series/리스트 (판매 CSV의 ymw 컬럼)
+
+    Returns:
+        str: YMW_FORMATS 키
+
+    Raises:
+        ValueError: 라벨이 비었거나 알려진 형식과 맞지 않을 때
+    """
+    labels = pd.Series(labels, dtype=object).dropna().astype(str).str.strip()
+    if labels.empty:
+        raise ValueError("ymw 라벨이 없어 형식을 감지할 수 없습니다.")
+    for fmt, pattern in YMW_FORMATS.items():
+        if labels.str.fullmatch(pattern).all():
+            return fmt
+    raise ValueError(f"알 수 없는 ymw 형식: {labels.iloc[0]!r} (지원: {', '.join(YMW_FORMATS)})")
+
+
+def to_ymw(dates, fmt=DEFAULT_YMW_FORMAT):
+    """
+    일자 → ymw 주차 라벨
+
+    Args:
+        dates: 일자 Series (문자열/datetime)
+        fmt: YMW_FORMATS 키 (판매 CSV와 같은 형식이어야 조인됨, detect_ymw_format 참고)
+
+    Returns:
+        Series: ymw 문자열 (파싱 불가 일자는 NaN)
+    """
+    dates = pd.to_datetime(pd.Series(dates), errors='coerce')
+    if fmt == 'iso_week':
+        iso = dates.dt.isocalendar()
+        ymw = iso['year'].astype(str) + '-W' + iso['week'].astype(str).str.zfill(2)
+    elif fmt in ('month_week', 'month_week_w'):
+        week = ((dates.dt.day - 1) // 7 + 1).astype('Int64').astype(str)
+        ymw = dates.dt.strftime('%Y-%m') + ('-W' if fmt == 'month_week_w' else '-') + week
+    else:
+        raise ValueError(f"지원하지 않는 ymw 형식: {fmt}")
+    return ymw.where(dates.notna())
+
+
+def ymw_days(labels, fmt=DEFAULT_YMW_FORMAT):
+    """
+    ymw 주차에 포함된 일수 (month_week 형식의 월말 주차는 7일 미만)
+
+    Args:
+        labels: ymw 라벨 Series
+        fmt: YMW_FORMATS 키
+
+    Returns:
+        Series: 일수
+    """
+    labels = pd.Series(labels).astype(str)
+    if fmt == 'iso_week':
+        return pd.Series(7, index=labels.index)
+    parts = labels.str.replace('W', '', regex=False).str.split('-', expand=True).astype(int)
+    month_days = pd.to_datetime(parts[0].astype(str) + '-' + parts[1].astype(str) + '-01').dt.days_in_month
+    return np.minimum(7, month_days - 7 * (parts[2] - 1))
+
+
+def load_market_panel(viral_path=VIRAL_PATH, sales_path=SALES_PATH, review_path=None):
+    """
+    주간 바이럴 지수/판매 점수 CSV를 읽어 ymw 기준 패널 생성
+
+    Args:
+        viral_path: 주간 뉴스 바이럴 지수 CSV (ymw, category, viral_index, viral_index_smoothed)
+        sales_path: 주간 베스트셀러 점수 CSV (ymw, category, sales_score)
+        review_path: 주간 리뷰 신호 CSV (ymw, category, review_velocity, helpful_weighted_rating), 선택
+
+    Returns:
+        MarketPanel: viral_index, viral_index_smoothed, sales_score (+ 리뷰 신호) 지표 패널
+    """
+    df_viral = pd.read_csv(viral_path, encoding='utf-8-sig')
+    df_sales = pd.read_csv(sales_path, encoding='utf-8-sig')
+
+    frames = [
+        (df_viral, ['viral_index', 'viral_index_smoothed']),
+        (df_sales, ['sales_score']),
+    ]
+    if review_path:
+        df_review = pd.read_csv(review_path, encoding='utf-8-sig')
+        frames.append((df_review, ['review_count', 'review_velocity', 'helpful_weighted_rating']))
+
+    return MarketPanel.from_frames(frames, period_col='ymw')
+
+
+def build_trend_share_panel(df_trends, df_share):
+    """
+    월별 Google Trends 지수(long)와 월별 점유율(wide)을 month 기준 패널로 결합
+
+    Args:
+        df_trends: month, keyword, category, index 컬럼 데이터프레임
+        df_share: month × category 점유율(%) 테이블
+
+    Returns:
+        MarketPanel: trend(카테고리별 키워드 평균 지수), share 지표 패널
+    """
+    # 카테고리별 키워드 평균 지수
+    df_trends_agg = df_trends.groupby(['month', 'category'])['index'].mean().reset_index()
+    trend_panel = MarketPanel.from_frames([(df_trends_agg, {'index': 'trend'})], period_col='month')
+    share_panel = MarketPanel.from_wide(df_share, 'share')
+    return trend_panel.join(share_panel)
@@ -7,11 +7,11 @@ Google Trends 키워드 수집 + 도서 카테고리 분류 + 상관분석
 
 import pandas as pd
 import numpy as np
-from pytrends.request import TrendReq
 from datetime import datetime, timedelta
 import time
 import re
 from scipy.stats import spearmanr
+from market_panel import build_trend_share_panel
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -43,13 +43,15 @@ KEYWORDS_MAP = {
 # 2. Google Trends 데이터 수집
 # =============================================================================
 
-def collect_google_trends(start_date='2024-01-01', end_date='2025-01-31'):
+def collect_google_trends(start_date='2024-01-01', end_date='2025-01-31', geo='KR', sleep_sec=2):
     """
     Google Trends에서 월별 키워드 검색 지수 수집
 
     Args:
         start_date: 시작 날짜 (YYYY-MM-DD)
         end_date: 종료 날짜 (YYYY-MM-DD)
+        geo: 지역 코드 (KR, KR-11 등)
+        sleep_sec: 요청 간 대기 시간 (초)
 
     Returns:
         DataFrame: month, keyword, category, index 컬럼
@@ -58,6 +60,9 @@ def collect_google_trends(start_date='2024-01-01', end_date='2025-01-31'):
     print("Google Trends 데이터 수집 시작")
     print("=" * 80)
 
+    # pytrends는 수집 단계에서만 필요 (분석/CLI 경량 명령의 import 비용 절감)
+    from pytrends.request import TrendReq
+
     pytrends = TrendReq(hl='ko', tz=540, timeout=(10, 25))
     timeframe = f'{start_date} {end_date}'
     results = []
@@ -70,7 +75,7 @@ def collect_google_trends(start_date='2024-01-01', end_date='2025-01-31'):
                 print(f"  - '{kw}' 키워드 수집 중...", end=' ')
 
                 # Google Trends API 호출
-                pytrends.build_payload([kw], timeframe=timeframe, geo='KR')
+                pytrends.build_payload([kw], timeframe=timeframe, geo=geo)
                 data = pytrends.interest_over_time()
 
                 if not data.empty and kw in data.columns:
@@ -90,11 +95,11 @@ def collect_google_trends(start_date='2024-01-01', end_date='2025-01-31'):
                     print(f"✗ 데이터 없음")
 
                 # API Rate Limit 대응
-                time.sleep(2)
+                time.sleep(sleep_sec)
 
             except Exception as e:
                 print(f"✗ 오류: {str(e)[:50]}")
-                time.sleep(5)
+                time.sleep(sleep_sec * 2.5)
                 continue
 
     if results:
@@ -258,13 +263,14 @@ def calculate_new_entries(df_bestseller):
 # 5. 트렌드 vs 점유율 상관분석
 # =============================================================================
 
-def analyze_correlation(df_trends, df_share):
+def analyze_correlation(df_trends, df_share, panel=None):
     """
     Google Trends 지수와 카테고리 점유율 상관분석
 
     Args:
         df_trends: Google Trends 데이터
         df_share: 월별 카테고리 점유율 데이터
+        panel: 미리 생성한 MarketPanel (trend, share 지표). None이면 두 데이터로 생성
 
     Returns:
         DataFrame: 카테고리별 상관계수 및 패턴
@@ -273,9 +279,14 @@ def analyze_correlation(df_trends, df_share):
     print("트렌드 vs 점유율 상관분석")
     print("=" * 80)
 
-    # 카테고리별 키워드 평균 지수
-    df_trends_agg = df_trends.groupby(['month', 'category'])['index'].mean().reset_index()
-    df_trends_pivot = df_trends_agg.pivot(index='month', columns='category', values='index')
+    # 카테고리 × 월 패널로 한 번만 정렬
+    if panel is None:
+        panel = build_trend_share_panel(df_trends, df_share)
+
+    # 두 데이터에 모두 있는 월 (월 단위 교집합, 카테고리별 결측 월은 상관 계산에서 제외)
+    periods = panel.periods.astype(str)
+    common_months = (np.isin(periods, df_share.index.astype(str))
+                     & np.isin(periods, df_trends['month'].astype(str).unique()))
 
     results = []
 
@@ -283,20 +294,17 @@ def analyze_correlation(df_trends, df_share):
         if category == '기타/미분류':
             continue
 
-        if category not in df_trends_pivot.columns:
+        if not panel.has_category(category):
             continue
 
-        # 데이터 정렬 (month 기준)
-        share = df_share[category].sort_index()
-        trend = df_trends_pivot[category].sort_index()
-
         # 공통 월만 사용
-        common_months = share.index.intersection(trend.index)
-        if len(common_months) < 3:
+        if common_months.sum() < 3:
             continue
 
-        share_aligned = share.loc[common_months]
-        trend_aligned = trend.loc[common_months]
+        share_aligned = panel.series('share', category)[common_months].astype(np.float64)
+        trend_aligned = panel.series('trend', category)[common_months].astype(np.float64)
+        if np.isnan(trend_aligned).all():
+            continue
 
         # 동행 상관 (같은 달)
         try:
@@ -304,12 +312,10 @@ def analyze_correlation(df_trends, df_share):
         except:
             corr_concurrent, p_conc = 0, 1
 
-        # 1개월 지연 상관
-        if len(common_months) > 1:
+        # 1개월 지연 상관 (공통 월 기준 직전 월 트렌드 ↔ 해당 월 점유율)
+        if len(trend_aligned) > 1:
             try:
-                trend_lag1 = trend_aligned.shift(1).dropna()
-                share_lag1 = share_aligned.loc[trend_lag1.index]
-                corr_lagged, p_lag = spearmanr(trend_lag1, share_lag1, nan_policy='omit')
+                corr_lagged, p_lag = spearmanr(trend_aligned[:-1], share_aligned[1:], nan_policy='omit')
             except:
                 corr_lagged, p_lag = 0, 1
         else:
@@ -330,8 +336,8 @@ def analyze_correlation(df_trends, df_share):
             'corr_lagged': round(corr_lagged, 3),
             'p_lagged': round(p_lag, 3),
             'pattern': pattern,
-            'trend_avg': round(trend_aligned.mean(), 1),
-            'share_avg': round(share_aligned.mean(), 1)
+            'trend_avg': round(float(np.nanmean(trend_aligned)), 1),
+            'share_avg': round(float(np.nanmean(share_aligned)), 1)
         })
 
     df_results = pd.DataFrame(results)
@@ -500,7 +506,8 @@ def main():
     # -------------------------------------------------------------------------
     # STEP 4: 상관분석
     # -------------------------------------------------------------------------
-    df_correlation = analyze_correlation(df_trends, df_share)
+    panel = build_trend_share_panel(df_trends, df_share)
+    df_correlation = analyze_correlation(df_trends, df_share, panel=panel)
 
     # -------------------------------------------------------------------------
     # STEP 5: 인사이트 생성
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+뉴스/도서 카테고리 ML 분류기
+문자 n-gram HashingVectorizer(어휘 사전 없음) + 선형 모델, 청크 단위 학습/예측
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+
+# =============================================================================
+# 1. 설정
+# =============================================================================
+
+CLASSIFIER_PATH = 'analysis/correlation/category_classifier.joblib'
+UNCLASSIFIED = '기타/미분류'
+
+# 분류에 사용할 텍스트 역할 → 컬럼명 후보 (도서/뉴스 공용, 존재하는 첫 컬럼 사용)
+# 도서 CSV(title/keywords)로 학습한 모델을 뉴스 CSV(제목/키워드)에 그대로 적용하기 위함
+TEXT_ROLES = {
+    'title': ['title', '제목'],
+    'subtitle': ['subtitle'],
+    'description': ['description'],
+    'keywords': ['keywords', '키워드'],
+}
+TEXT_COLUMNS = [col for cols in TEXT_ROLES.values() for col in cols]
+
+N_FEATURES = 2 ** 18
+CHUNK_SIZE = 20000
+
+# =============================================================================
+# 2. 피처
+# =============================================================================
+
+def make_vectorizer():
+    """상태 없는 문자 n-gram 해싱 벡터라이저 (학습/예측 시 동일하게 재생성)"""
+    return HashingVectorizer(
+        analyzer='char_wb',
+        ngram_range=(2, 4),
+        n_features=N_FEATURES,
+        alternate_sign=False,
+        norm='l2',
+        dtype=np.float32,
+    )
+
+
+def _text_role(name):
+    """컬럼명/역할명 → 역할명 (알 수 없으면 그대로)"""
+    for role, cols in TEXT_ROLES.items():
+        if name == role or name in cols:
+            return role
+    return name
+
+
+def resolve_text_columns(df, text_cols=None):
+    """
+    데이터프레임에서 역할별로 사용할 텍스트 컬럼 결정
+
+    Args:
+        df: 도서/뉴스 데이터프레임
+        text_cols: 역할/컬럼명 리스트 (None이면 전체 역할, 학습 시 번들에 저장된 값)
+
+    Returns:
+        list: (역할, 컬럼명) 튜플 리스트, TEXT_ROLES 순서
+    """
+    def resolve(roles):
+        resolved = []
+        for role in TEXT_ROLES:
+            if role in roles:
+                col = next((c for c in TEXT_ROLES[role] if c in df.columns), None)
+                if col:
+                    resolved.append((role, col))
+        # 역할 매핑이 없는 임의 컬럼명은 그대로 사용
+        resolved += [(name, name) for name in roles if name not in TEXT_ROLES and name in df.columns]
+        return resolved
+
+    roles = [_text_role(c) for c in (text_cols or TEXT_ROLES)]
+    resolved = resolve(roles)
+    if not resolved and text_cols:
+        # 학습 때와 겹치는 역할이 없으면 존재하는 텍스트 컬럼 전체로 대체
+        resolved = resolve(list(TEXT_ROLES))
+    return resolved
+
+
+def build_text(df, text_cols=None):
+    """
+    분류용 텍스트 컬럼을 역할 순서(제목, 부제, 설명, 키워드)로 하나의 문자열로 결합
+
+    Args:
+        df: 도서/뉴스 데이터프레임
+        text_cols: 역할/컬럼명 리스트 (None이면 TEXT_ROLES 전체, 'title'은 '제목'과 같이 매핑)
+
+    Returns:
+        Series: 결합된 텍스트
+
+    Raises:
+        ValueError: TEXT_COLUMNS 중 하나도 없을 때
+    """
+    cols = [col for _, col in resolve_text_columns(df, text_cols)]
+    if not cols:
+        raise ValueError(f"분류할 텍스트 컬럼이 없습니다: {TEXT_COLUMNS}")
+    text = df[cols[0]].fillna('').astype(str)
+    for col in cols[1:]:
+        text = text + ' ' + df[col].fillna('').astype(str)
+    return text
+
+# =============================================================================
+# 3. 학습
+# =============================================================================
+
+def train_classifier(df_labeled, label_col='category', text_cols=None, epochs=5,
+                     chunk_size=CHUNK_SIZE, holdout=0.1, random_state=42):
+    """
+    라벨된 도서/뉴스로 카테고리 분류기 학습 (청크 단위 partial_fit)
+
+    Args:
+        df_labeled: 라벨 컬럼이 있는 데이터프레임
+        label_col: 라벨 컬럼명 (예: category, 카테고리)
+        text_cols: 텍스트 역할/컬럼 리스트 (None이면 TEXT_ROLES 중 존재하는 것)
+        epochs: 전체 데이터 반복 횟수
+        chunk_size: partial_fit 청크 크기
+        holdout: 검증용 비율 (0이면 검증 생략)
+        random_state: 셔플/분할 시드
+
+    Returns:
+        dict: model(SGDClassifier), classes, text_cols(학습에 쓴 텍스트 역할), holdout_accuracy
+    """
+    print("\n" + "=" * 80)
+    print("카테고리 분류기 학습")
+    print("=" * 80)
+
+    df = df_labeled[df_labeled[label_col].notna()].sample(frac=1, random_state=random_state)
+    texts = build_text(df, text_cols)
+    labels = df[label_col].astype(str).to_numpy()
+
+    n_holdout = int(len(df) * holdout)
+    vectorizer = make_vectorizer()
+    X_all = vectorizer.transform(texts)
+    X_train, y_train = X_all[n_holdout:], labels[n_holdout:]
+    classes = np.unique(labels)
+
+    model = SGDClassifier(loss='log_loss', alpha=1e-5, random_state=random_state)
+    rng = np.random.default_rng(random_state)
+    for _ in range(epochs):
+        order = rng.permutation(X_train.shape[0])
+        for start in range(0, len(order), chunk_size):
+            idx = order[start:start + chunk_size]
+            model.partial_fit(X_train[idx], y_train[idx], classes=classes)
+
+    accuracy = None
+    if n_holdout > 0:
+        accuracy = float((model.predict(X_all[:n_holdout]) == labels[:n_holdout]).mean())
+
+    print(f"\n학습 데이터: {X_train.shape[0]}건, 카테고리 {len(classes)}개")
+    if accuracy is not None:
+        print(f"검증 정확도: {accuracy:.1%} ({n_holdout}건)")
+
+    return {
+        'model': model,
+        'classes': classes,
+        'text_cols': [role for role, _ in resolve_text_columns(df, text_cols)],
+        'holdout_accuracy': accuracy,
+    }
+
+
+def save_classifier(bundle, path=CLASSIFIER_PATH):
+    import joblib
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    joblib.dump(bundle, path, compress=3)
+    print(f"✓ 분류기 저장: {path}")
+
+
+def load_classifier(path=CLASSIFIER_PATH):
+    import joblib
+
+    return joblib.load(path)
+
+# =============================================================================
+# 4. 예측
+# =============================================================================
+
+def predict_categories(bundle, texts, threshold=0.0):
+    """
+    텍스트 배열의 카테고리/신뢰도 예측
+
+    Args:
+        bundle: train_classifier/load_classifier 결과
+        texts: 문자열 Series 또는 리스트
+        threshold: 최고 확률이 이 값 미만이면 '기타/미분류'
+
+    Returns:
+        tuple: (카테고리 배열, 신뢰도 배열)
+    """
+    proba = bundle['model'].predict_proba(make_vectorizer().transform(texts))
+    best = proba.argmax(axis=1)
+    confidence = proba[np.arange(len(best)), best]
+    categories = np.where(confidence >= threshold, bundle['classes'][best], UNCLASSIFIED)
+    return categories, confidence.round(4)
+
+
+def classify_bestseller_data_ml(df_bestseller, bundle, threshold=0.0, chunk_size=CHUNK_SIZE):
+    """
+    베스트셀러/뉴스 데이터프레임에 ML 카테고리 컬럼 추가
+    (classify_bestseller_data와 동일한 category 컬럼 + category_confidence)
+
+    Args:
+        df_bestseller: 도서/뉴스 데이터프레임
+        bundle: 학습된 분류기
+        threshold: 최소 신뢰도 (미만은 '기타/미분류')
+        chunk_size: 예측 청크 크기
+
+    Returns:
+        DataFrame: category, category_confidence 컬럼이 추가된 데이터프레임
+    """
+    print("\n" + "=" * 80)
+    print("도서 카테고리 ML 분류 시작")
+    print("=" * 80)
+
+    texts = build_text(df_bestseller, bundle['text_cols'])
+    categories, confidence = [], []
+    for start in range(0, len(texts), chunk_size):
+        cats, conf = predict_categories(bundle, texts.iloc[start:start + chunk_size], threshold)
+        categories.append(cats)
+        confidence.append(conf)
+
+    df_bestseller['category'] = np.concatenate(categories) if categories else []
+    df_bestseller['category_confidence'] = np.concatenate(confidence) if confidence else []
+
+    unclassified_rate = (df_bestseller['category'] == UNCLASSIFIED).mean()
+    print(f"\n[분류 결과]")
+    print(f"총 건수: {len(df_bestseller)}")
+    print(f"미분류 비율: {unclassified_rate:.1%}")
+    print(f"평균 신뢰도: {df_bestseller['category_confidence'].mean():.3f}")
+    print(f"\n카테고리별 분포:")
+    print(df_bestseller['category'].value_counts())
+
+    return df_bestseller
+
+
+def classify_csv_stream(in_path, out_path, bundle, threshold=0.0, chunk_size=CHUNK_SIZE):
+    """
+    대용량 CSV(예: 6만여 건 뉴스)를 청크 단위로 읽어 분류 결과를 바로 기록
+
+    Args:
+        in_path: 입력 CSV
+        out_path: 출력 CSV (category, category_confidence 컬럼 추가)
+        bundle: 학습된 분류기
+        threshold: 최소 신뢰도
+        chunk_size: 읽기/예측 청크 크기
+
+    Returns:
+        Series: 카테고리별 건수
+    """
+    print("\n" + "=" * 80)
+    print(f"스트리밍 분류: {in_path}")
+    print("=" * 80)
+
+    counts = pd.Series(dtype=np.int64)
+    total = 0
+    for i, chunk in enumerate(pd.read_csv(in_path, encoding='utf-8-sig', chunksize=chunk_size)):
+        cats, conf = predict_categories(bundle, build_text(chunk, bundle['text_cols']), threshold)
+        chunk['category'] = cats
+        chunk['category_confidence'] = conf
+        chunk.to_csv(out_path, mode='w' if i == 0 else 'a', header=(i == 0),
+                     index=False, encoding='utf-8-sig' if i == 0 else 'utf-8')
+        counts = counts.add(chunk['category'].value_counts(), fill_value=0)
+        total += len(chunk)
+        print(f"  - {total}건 처리")
+
+    counts = counts.astype(np.int64).sort_values(ascending=False)
+    print(f"\n카테고리별 분포:")
+    print(counts)
+    print(f"\n✓ 저장: {out_path}")
+    return counts
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+주간 산출물/대시보드 증분 갱신 (watch 모드)
+입력 파일 지문(mtime, 크기, sha256) 비교 → 리뷰 신호는 변경 파일만 재집계
+→ (카테고리, 주차) 행 다이제스트 비교 → 데이터가 바뀐 카테고리 대시보드만 다시 생성
+"""
+
+import os
+import glob
+import json
+import time
+import hashlib
+
+import pandas as pd
+
+import market_panel
+import visualize_market_trends as vmt
+
+# =============================================================================
+# 1. 설정
+# =============================================================================
+
+REFRESH_DIR = 'analysis/refresh'
+STATE_FILE = 'refresh_state.json'
+WATCH_INTERVAL = 60
+
+# 주간 CSV의 원천 데이터 (변경 여부만 보고, 주간 CSV 갱신 시 대시보드에 반영)
+SOURCE_GLOBS = ['news_*.csv', 'kyobo_bestseller_*.csv']
+
+# =============================================================================
+# 2. 입력 파일 지문
+# =============================================================================
+
+def _sha256(path, block_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def fingerprint_files(paths, previous=None):
+    """
+    파일별 지문 (mtime/크기가 그대로면 이전 sha256 재사용, 바뀐 파일만 해시)
+
+    Args:
+        paths: 파일 경로 리스트 (없는 파일은 제외)
+        previous: 이전 실행의 {경로: 지문}
+
+    Returns:
+        tuple: ({경로: {mtime, size, sha256}}, 내용이 바뀐/추가된 경로 리스트, 삭제된 경로 리스트)
+    """
+    previous = previous or {}
+    current, changed = {}, []
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        stat = os.stat(path)
+        prev = previous.get(path)
+        if prev and prev['mtime'] == stat.st_mtime and prev['size'] == stat.st_size:
+            current[path] = prev
+            continue
+        # mtime만 바뀐 경우(touch, 동일 내용 재저장)는 변경으로 보지 않음
+        current[path] = {'mtime': stat.st_mtime, 'size': stat.st_size, 'sha256': _sha256(path)}
+        if not prev or prev['sha256'] != current[path]['sha256']:
+            changed.append(path)
+    removed = [path for path in previous if path not in current]
+    return current, changed, removed
+
+# =============================================================================
+# 3. (카테고리, 주차) 다이제스트
+# =============================================================================
+
+def category_week_digests(panel, categories):
+    """
+    대시보드에 그려지는 (카테고리, 주차) 행별 다이제스트
+
+    Returns:
+        dict: {카테고리: {ymw: 행 해시}}
+    """
+    common = panel.mask('viral_index', 'sales_score')
+    digests = {}
+    for category in categories:
+        merged = vmt.category_frame(panel, category, common)
+        hashes = pd.util.hash_pandas_object(merged.set_index('ymw'), index=True)
+        digests[str(category)] = {ymw: format(h, '016x') for ymw, h in zip(merged['ymw'], hashes.to_numpy())}
+    return digests
+
+
+def diff_digests(previous, current):
+    """
+    카테고리별 변경 주차 (추가/수정/삭제)
+
+    Returns:
+        dict: {카테고리: 변경 ymw 리스트} (변경 없는 카테고리 제외)
+    """
+    changes = {}
+    for category in set(previous) | set(current):
+        old, new = previous.get(category, {}), current.get(category, {})
+        weeks = sorted(w for w in set(old) | set(new) if old.get(w) != new.get(w))
+        if weeks:
+            changes[category] = weeks
+    return changes
+
+# =============================================================================
+# 4. 1회 갱신 / watch 루프
+# =============================================================================
+
+def load_state(state_dir=REFRESH_DIR):
+    path = os.path.join(state_dir, STATE_FILE)
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    return {'files': {}, 'digests': {}}
+
+
+def save_state(state, state_dir=REFRESH_DIR):
+    os.makedirs(state_dir, exist_ok=True)
+    path = os.path.join(state_dir, STATE_FILE)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(path + '.tmp', path)
+
+
+def refresh_once(viral_path=market_panel.VIRAL_PATH, sales_path=market_panel.SALES_PATH,
+                 review_files=None, books_path=None, review_lookup=None, source_globs=SOURCE_GLOBS,
+                 state_dir=REFRESH_DIR, force=False):
+    """
+    변경된 입력만 반영해 주간 산출물/대시보드 갱신
+
+    Args:
+        viral_path, sales_path: 주간 바이럴 지수/판매 점수 CSV
+        review_files: 리뷰 CSV 리스트 (None이면 review_aggregation.REVIEW_GLOB)
+        books_path: 리뷰 카테고리 룩업용 도서 CSV (None이고 review_lookup도 없으면 리뷰 단계 생략)
+        review_lookup: 판매 CSV와 같은 카테고리의 product_code → category CSV (books_path보다 우선)
+        source_globs: 변경 여부만 보고할 원천 파일 패턴
+        state_dir: 지문/다이제스트 상태 저장 디렉토리
+        force: 상태를 무시하고 전체 재생성
+
+    Returns:
+        dict: changed_files, changed_weeks({카테고리: [ymw]}), rendered(다시 생성한 대시보드 경로)
+    """
+    import review_aggregation
+
+    state = {'files': {}, 'digests': {}} if force else load_state(state_dir)
+
+    if review_files is None:
+        review_files = sorted(glob.glob(review_aggregation.REVIEW_GLOB))
+    sources = sorted({p for pattern in source_globs for p in glob.glob(pattern)})
+    lookup_source = review_lookup or books_path
+    watched = [viral_path, sales_path] + list(review_files) + sources + ([lookup_source] if lookup_source else [])
+
+    files, changed, removed = fingerprint_files(watched, state['files'])
+    result = {'changed_files': changed + removed, 'changed_weeks': {}, 'rendered': []}
+    if not changed and not removed:
+        if files != state['files']:
+            # 내용은 같고 mtime만 바뀐 파일: 다음 확인 때 다시 해시하지 않도록 지문만 갱신
+            state['files'] = files
+            save_state(state, state_dir)
+        return result
+
+    print("\n" + "=" * 80)
+    print(f"증분 갱신: 변경 파일 {len(changed)}개, 삭제 {len(removed)}개")
+    print("=" * 80)
+    for path in changed + removed:
+        print(f"  - {path}")
+
+    # 리뷰 신호: 파일 단위 부분 합계 재사용 (변경된 리뷰 파일만 다시 읽음)
+    if lookup_source and set(list(review_files) + [lookup_source, sales_path]) & set(changed + removed):
+        try:
+            review_aggregation.update_review_signals(review_files, books_path=books_path,
+                                                     lookup_path=review_lookup, sales_path=sales_path)
+        except ValueError as e:
+            print(f"⚠️  리뷰 단계 생략: {e}")
+
+    stale_sources = [p for p in sources if p in changed]
+    if stale_sources and not {viral_path, sales_path} & set(changed):
+        print("⚠️  원천 파일이 바뀌었지만 주간 바이럴/판매 CSV는 그대로입니다 (주간 CSV 갱신 후 반영).")
+
+    # 대시보드: 데이터 행이 바뀐 카테고리만 다시 생성
+    if os.path.exists(viral_path) and os.path.exists(sales_path):
+        panel = market_panel.load_market_panel(viral_path, sales_path)
+        categories = vmt.dashboard_categories(panel)
+        digests = category_week_digests(panel, categories)
+        changes = diff_digests(state['digests'], digests)
+        missing = [c for c in categories if not os.path.exists(vmt.dashboard_path(c))]
+        targets = [c for c in categories if c in changes or c in missing]
+
+        os.makedirs(vmt.SAVE_PATH, exist_ok=True)
+        common = panel.mask('viral_index', 'sales_score')
+        for category in targets:
+            weeks = changes.get(category, [])
+            print(f"  ✓ [{category}] 변경 {len(weeks)}주 {weeks[-3:] if weeks else '(대시보드 없음)'} → 재생성")
+            path = vmt.render_category(panel, category, common)
+            if path:
+                result['rendered'].append(path)
+
+        result['changed_weeks'] = changes
+        state['digests'] = digests
+        print(f"\n대시보드 {len(categories)}개 중 {len(result['rendered'])}개 재생성")
+
+    state['files'] = files
+    save_state(state, state_dir)
+    return result
+
+
+def watch(interval=WATCH_INTERVAL, max_cycles=None, **kwargs):
+    """
+    interval초마다 refresh_once 실행 (Ctrl+C로 종료)
+
+    Args:
+        interval: 확인 주기 (초)
+        max_cycles: 최대 반복 횟수 (None이면 무한)
+        **kwargs: refresh_once 인자
+    """
+    print(f"watch 모드 시작 (주기 {interval}초, Ctrl+C로 종료)")
+    cycle = 0
+    try:
+        while max_cycles is None or cycle < max_cycles:
+            started = time.time()
+            result = refresh_once(**kwargs)
+            if result['changed_files']:
+                print(f"  갱신 완료 ({time.time() - started:.1f}초)")
+            cycle += 1
+            if max_cycles is None or cycle < max_cycles:
+                time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\nwatch 모드 종료")
+
+
+if __name__ == "__main__":
+    watch()
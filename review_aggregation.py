@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+리뷰 데이터 주간 집계
+리뷰 파일을 청크 단위로 스트리밍 → product_code로 카테고리 조인 → (category, ymw) 주간 신호
+(리뷰 속도, 도움됨 가중 평점, 감정 키워드 빈도), 변경된 파일만 재집계
+"""
+
+import os
+import glob
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+
+from market_panel import SALES_PATH, DEFAULT_YMW_FORMAT, detect_ymw_format, to_ymw, ymw_days
+
+# =============================================================================
+# 1. 설정
+# =============================================================================
+
+REVIEW_GLOB = 'kyobo_reviews_*.csv'
+BOOKS_PATH = 'Supabase Snippet Retrieve all books.csv'
+REVIEW_AGG_DIR = 'analysis/review_issues/weekly'
+SIGNALS_FILE = 'weekly_review_signals.csv'
+EMOTIONS_FILE = 'weekly_review_emotions.csv'
+STATE_FILE = 'state.json'
+
+CHUNK_SIZE = 50000
+REVIEW_COLUMNS = ['product_code', 'rating', 'emotion_keyword', 'review_date', 'helpful_count']
+
+# 파일별 부분 합계 컬럼 (매칭되는 리뷰가 없어도 헤더는 항상 기록)
+WEEKLY_COLUMNS = ['category', 'ymw', 'review_count', 'rated', 'rating_sum', 'helpful_weight', 'weighted_rating_sum']
+EMOTION_COLUMNS = ['category', 'ymw', 'emotion_keyword', 'count']
+
+# =============================================================================
+# 2. product_code → 카테고리 룩업
+# =============================================================================
+
+def build_category_lookup(books_path=BOOKS_PATH, lookup_path=None, sales_path=SALES_PATH):
+    """
+    product_code → category 룩업 테이블 로드
+
+    카테고리는 판매 CSV와 같은 분류 체계여야 (category, ymw)로 조인된다. 명시적 룩업 CSV가
+    없으면 도서 CSV의 category 컬럼을 사용하고, 둘 다 없으면 오류를 낸다.
+
+    Args:
+        books_path: 도서 CSV (product_code, category)
+        lookup_path: 명시적 product_code → category CSV (지정 시 books_path보다 우선)
+        sales_path: 카테고리 체계 검증용 판매 CSV (없으면 검증 생략)
+
+    Returns:
+        Series: index=product_code, values=category
+
+    Raises:
+        ValueError: category 컬럼이 없거나 판매 CSV 카테고리와 하나도 겹치지 않을 때
+    """
+    source = lookup_path or books_path
+    df_lookup = pd.read_csv(source, encoding='utf-8-sig', dtype={'product_code': str, 'category': str})
+    if not {'product_code', 'category'} <= set(df_lookup.columns):
+        raise ValueError(f"{source}에 product_code/category 컬럼이 없습니다. "
+                         "판매 CSV와 같은 카테고리의 룩업 CSV를 lookup_path로 지정하세요.")
+    df_lookup = df_lookup[['product_code', 'category']].dropna().drop_duplicates('product_code', keep='last')
+
+    if sales_path and os.path.exists(sales_path):
+        sales_categories = set(pd.read_csv(sales_path, encoding='utf-8-sig', usecols=['category'],
+                                           dtype=str)['category'].dropna())
+        unknown = sorted(set(df_lookup['category']) - sales_categories)
+        if len(unknown) == df_lookup['category'].nunique():
+            raise ValueError(f"{source}의 카테고리가 판매 CSV({sales_path})와 하나도 겹치지 않습니다: {unknown[:5]}")
+        if unknown:
+            print(f"⚠️  판매 CSV에 없는 카테고리 {len(unknown)}개는 패널에 조인되지 않습니다: {unknown[:5]}")
+
+    return pd.Series(df_lookup['category'].to_numpy(), index=pd.Index(df_lookup['product_code']))
+
+
+def resolve_ymw_format(sales_path=SALES_PATH):
+    """
+    판매 CSV의 ymw 라벨 형식 (파일이 없으면 DEFAULT_YMW_FORMAT)
+
+    Returns:
+        str: YMW_FORMATS 키
+    """
+    if sales_path and os.path.exists(sales_path):
+        labels = pd.read_csv(sales_path, encoding='utf-8-sig', usecols=['ymw'], dtype=str)['ymw']
+        return detect_ymw_format(labels)
+    print(f"⚠️  {sales_path} 없음 → ymw 형식 기본값({DEFAULT_YMW_FORMAT}) 사용")
+    return DEFAULT_YMW_FORMAT
+
+# =============================================================================
+# 3. 파일 단위 스트리밍 집계
+# =============================================================================
+
+def aggregate_review_file(path, lookup, chunk_size=CHUNK_SIZE, ymw_format=DEFAULT_YMW_FORMAT):
+    """
+    리뷰 파일 하나를 청크 단위로 읽어 (category, ymw) 부분 합계 계산
+
+    Args:
+        path: 리뷰 CSV 경로
+        lookup: build_category_lookup 결과
+        chunk_size: 읽기 청크 크기
+        ymw_format: 주차 라벨 형식 (판매 CSV와 동일해야 함)
+
+    Returns:
+        tuple: (주간 합계 DataFrame, 감정 키워드 빈도 DataFrame)
+    """
+    product_index = lookup.index
+    categories = lookup.to_numpy()
+    weekly_parts, emotion_parts = [], []
+
+    reader = pd.read_csv(path, encoding='utf-8-sig', chunksize=chunk_size,
+                         usecols=lambda c: c in REVIEW_COLUMNS, dtype={'product_code': str})
+    for chunk in reader:
+        # 사전 계산된 룩업으로 벡터화 조인 (미등록 상품은 제외)
+        codes = product_index.get_indexer(chunk['product_code'])
+        chunk = chunk[codes >= 0].assign(category=categories[codes[codes >= 0]])
+        chunk['ymw'] = to_ymw(chunk['review_date'], ymw_format)
+        chunk = chunk[chunk['ymw'].notna()]
+        if chunk.empty:
+            continue
+
+        rating = pd.to_numeric(chunk['rating'], errors='coerce')
+        # helpful_count가 없는 리뷰 파일은 모든 리뷰 가중치 1
+        helpful = (pd.to_numeric(chunk['helpful_count'], errors='coerce') if 'helpful_count' in chunk.columns
+                   else pd.Series(0, index=chunk.index))
+        weight = 1 + helpful.fillna(0).clip(lower=0)
+        chunk = chunk.assign(
+            rating_sum=rating.fillna(0),
+            rated=rating.notna().astype(np.int64),
+            helpful_weight=weight.where(rating.notna(), 0),
+            weighted_rating_sum=(rating * weight).fillna(0),
+        )
+
+        weekly_parts.append(chunk.groupby(['category', 'ymw']).agg(
+            review_count=('rating_sum', 'size'),
+            rated=('rated', 'sum'),
+            rating_sum=('rating_sum', 'sum'),
+            helpful_weight=('helpful_weight', 'sum'),
+            weighted_rating_sum=('weighted_rating_sum', 'sum'),
+        ))
+        if 'emotion_keyword' in chunk.columns:
+            emotion_parts.append(chunk.dropna(subset=['emotion_keyword'])
+                                 .groupby(['category', 'ymw', 'emotion_keyword']).size().rename('count'))
+
+    weekly = (pd.concat(weekly_parts).groupby(level=[0, 1]).sum().reset_index()
+              if weekly_parts else pd.DataFrame(columns=WEEKLY_COLUMNS))
+    emotions = (pd.concat(emotion_parts).groupby(level=[0, 1, 2]).sum().reset_index()
+                if emotion_parts else pd.DataFrame(columns=EMOTION_COLUMNS))
+    return weekly[WEEKLY_COLUMNS], emotions[EMOTION_COLUMNS]
+
+# =============================================================================
+# 4. 증분 갱신
+# =============================================================================
+
+def _file_signature(path):
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime': stat.st_mtime}
+
+
+def _part_name(path):
+    return hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()[:16]
+
+
+def _read_part(path, columns):
+    """부분 합계 CSV 읽기 (이전 버전이 남긴 헤더 없는 빈 파일은 빈 프레임으로 처리)"""
+    try:
+        return pd.read_csv(path, encoding='utf-8-sig', dtype={'category': str, 'ymw': str})
+    except pd.errors.EmptyDataError:
+        return pd.DataFrame(columns=columns)
+
+
+def _save_state(state_path, state):
+    with open(state_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(state_path + '.tmp', state_path)
+
+
+def update_review_signals(review_files=None, books_path=BOOKS_PATH, lookup_path=None, sales_path=SALES_PATH,
+                          out_dir=REVIEW_AGG_DIR, chunk_size=CHUNK_SIZE, ymw_format=None):
+    """
+    신규/변경 리뷰 파일만 재집계해 주간 카테고리 리뷰 신호 갱신
+
+    파일별 부분 합계를 parts/에 보관하므로, 파일이 추가·변경되면 해당 파일만 다시 읽고
+    삭제된 파일은 합계에서 빠진다.
+
+    Args:
+        review_files: 리뷰 CSV 경로 리스트 (None이면 REVIEW_GLOB)
+        books_path: product_code → 카테고리 룩업용 도서 CSV (category 컬럼 필요)
+        lookup_path: 판매 CSV와 같은 카테고리의 product_code → category CSV (지정 시 우선)
+        sales_path: 카테고리/ymw 형식 기준 판매 CSV
+        out_dir: 집계 결과/상태 저장 디렉토리
+        chunk_size: 읽기 청크 크기
+        ymw_format: 주차 라벨 형식 (None이면 판매 CSV 라벨에서 감지)
+
+    Returns:
+        tuple: (주간 신호 DataFrame, 감정 키워드 DataFrame, 재집계된 파일 리스트)
+    """
+    print("\n" + "=" * 80)
+    print("리뷰 주간 집계 (증분)")
+    print("=" * 80)
+
+    review_files = sorted(review_files if review_files is not None else glob.glob(REVIEW_GLOB))
+    parts_dir = os.path.join(out_dir, 'parts')
+    os.makedirs(parts_dir, exist_ok=True)
+
+    state_path = os.path.join(out_dir, STATE_FILE)
+    state = {}
+    if os.path.exists(state_path):
+        with open(state_path, encoding='utf-8') as f:
+            state = json.load(f)
+
+    # 룩업 파일이나 주차 형식이 바뀌면 전체 재집계
+    lookup = build_category_lookup(books_path, lookup_path, sales_path)
+    ymw_format = ymw_format or resolve_ymw_format(sales_path)
+    lookup_sig = dict(_file_signature(lookup_path or books_path), path=lookup_path or books_path, ymw=ymw_format)
+    if state.get('_books') != lookup_sig:
+        state = {'_books': lookup_sig}
+    print(f"\n룩업: {lookup_path or books_path} ({len(lookup)}개 상품), ymw 형식: {ymw_format}")
+
+    changed = [path for path in review_files if state.get(path) != _file_signature(path)]
+    removed = [path for path in state if path != '_books' and path not in review_files]
+    print(f"\n리뷰 파일 {len(review_files)}개 중 재집계 {len(changed)}개, 삭제 {len(removed)}개")
+
+    for path in removed:
+        for suffix in ('weekly', 'emotion'):
+            part = os.path.join(parts_dir, f'{_part_name(path)}_{suffix}.csv')
+            if os.path.exists(part):
+                os.remove(part)
+        state.pop(path)
+
+    for path in changed:
+        print(f"  - {path} 집계 중...")
+        weekly, emotions = aggregate_review_file(path, lookup, chunk_size, ymw_format)
+        name = _part_name(path)
+        weekly.to_csv(os.path.join(parts_dir, f'{name}_weekly.csv'), index=False, encoding='utf-8-sig')
+        emotions.to_csv(os.path.join(parts_dir, f'{name}_emotion.csv'), index=False, encoding='utf-8-sig')
+        state[path] = _file_signature(path)
+
+    # 파일별 부분 합계 → 전체 주간 신호
+    weekly_parts = [_read_part(os.path.join(parts_dir, f'{_part_name(p)}_weekly.csv'), WEEKLY_COLUMNS)
+                    for p in review_files]
+    weekly_parts = [df for df in weekly_parts if not df.empty]
+    if not weekly_parts:
+        _save_state(state_path, state)
+        print("\n⚠️  집계된 리뷰가 없습니다.")
+        return pd.DataFrame(), pd.DataFrame(), changed
+
+    signals = pd.concat(weekly_parts).groupby(['category', 'ymw'], as_index=False).sum()
+    signals['review_velocity'] = (signals['review_count'] / ymw_days(signals['ymw'], ymw_format)).round(3)
+    signals['avg_rating'] = (signals['rating_sum'] / signals['rated'].replace(0, np.nan)).round(3)
+    signals['helpful_weighted_rating'] = (signals['weighted_rating_sum']
+                                         / signals['helpful_weight'].replace(0, np.nan)).round(3)
+    signals = signals[['category', 'ymw', 'review_count', 'review_velocity',
+                       'avg_rating', 'helpful_weighted_rating']].sort_values(['category', 'ymw'])
+
+    emotion_parts = [_read_part(os.path.join(parts_dir, f'{_part_name(p)}_emotion.csv'), EMOTION_COLUMNS)
+                     for p in review_files]
+    emotion_parts = [df for df in emotion_parts if not df.empty]
+    emotions = (pd.concat(emotion_parts).groupby(['category', 'ymw', 'emotion_keyword'], as_index=False)['count'].sum()
+                if emotion_parts else pd.DataFrame(columns=EMOTION_COLUMNS))
+
+    signals.to_csv(os.path.join(out_dir, SIGNALS_FILE), index=False, encoding='utf-8-sig')
+    emotions.to_csv(os.path.join(out_dir, EMOTIONS_FILE), index=False, encoding='utf-8-sig')
+
+    # 병합/저장까지 끝난 뒤에만 상태 기록 (중간 실패 시 다음 실행에서 다시 집계)
+    _save_state(state_path, state)
+
+    print(f"\n[주간 리뷰 신호] {signals['category'].nunique()}개 카테고리, {signals['ymw'].nunique()}주")
+    print(signals.tail(10).to_string(index=False))
+    print(f"\n✓ 저장: {os.path.join(out_dir, SIGNALS_FILE)}, {os.path.join(out_dir, EMOTIONS_FILE)}")
+
+    return signals, emotions, changed
+
+
+if __name__ == "__main__":
+    update_review_signals()
@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+교보문고 리뷰/도서 상세 비동기 일괄 수집
+Supabase books 상품 목록 → keep-alive 커넥션 풀(httpx) + 동시성 제한 + 호스트별 요청 속도 제한
+→ 상품별 커서 저장(중단 후 재개) → JSONL 누적 → kyobo_reviews_*.csv 스키마로 내보내기
+"""
+
+import os
+import json
+import time
+import asyncio
+import hashlib
+import threading
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+import pandas as pd
+
+# =============================================================================
+# 1. 설정
+# =============================================================================
+
+KYOBO_BASE_URL = 'https://product.kyobobook.co.kr'
+REVIEW_PATH = '/api/review/list'
+DETAIL_PATH = '/api/gw/pdt/product/{product_code}'
+
+BOOKS_PATH = 'Supabase Snippet Retrieve all books.csv'
+FETCH_DIR = 'analysis/reviews_raw'
+CURSOR_DIR = 'cursors'
+REVIEWS_JSONL = 'reviews.jsonl'
+DETAILS_JSONL = 'details.jsonl'
+
+# 누적 JSONL 전체를 매번 덮어쓰는 단일 파일 (리뷰 집계 REVIEW_GLOB에 한 번만 잡히도록 날짜 없는 고정 이름)
+EXPORT_PATH = 'kyobo_reviews_fetched.csv'
+
+MAX_REVIEWS = 300      # 도서당 최대 리뷰 수
+PAGE_SIZE = 10
+CONCURRENCY = 8        # 동시에 처리할 상품 수
+RATE_PER_SEC = 5.0     # 호스트별 초당 요청 수
+MAX_RETRIES = 4
+
+# 교보문고 리뷰 API 필드 → 리뷰 CSV 스키마 (PROJECT1_SUMMARY.md 리뷰 데이터)
+REVIEW_FIELDS = {
+    'revwCntt': 'review_content',
+    'revwRvgr': 'rating',
+    'revwEmtnKywrName': 'emotion_keyword',
+    'mmbrId': 'reviewer_id',
+    'cretDttm': 'review_date',
+    'recmCont': 'helpful_count',
+    'cmntCont': 'comment_count',
+}
+REVIEW_COLUMNS = ['product_code'] + list(REVIEW_FIELDS.values())
+
+# =============================================================================
+# 2. 호스트별 요청 속도 제한 (토큰 버킷)
+# =============================================================================
+
+class TokenBucket:
+    """초당 rate개 토큰이 채워지는 버킷 (capacity만큼 순간 요청 허용)"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class HostRateLimiter:
+    """요청 URL의 호스트별로 TokenBucket을 분리해 적용"""
+
+    def __init__(self, rate=RATE_PER_SEC):
+        self.rate = rate
+        self.buckets = {}
+
+    async def acquire(self, url):
+        host = urlsplit(url).netloc
+        if host not in self.buckets:
+            self.buckets[host] = TokenBucket(self.rate)
+        await self.buckets[host].acquire()
+
+# =============================================================================
+# 3. 상품 목록 / 커서
+# =============================================================================
+
+def load_products(books_path=BOOKS_PATH):
+    """
+    Supabase books CSV에서 수집 대상 상품 목록 로드
+
+    Returns:
+        list: (product_code, product_url) 튜플 리스트 (중복 제거)
+    """
+    df = pd.read_csv(books_path, encoding='utf-8-sig', dtype=str,
+                     usecols=lambda c: c in ('product_code', 'product_url'))
+    df = df.dropna(subset=['product_code']).drop_duplicates('product_code')
+    urls = df['product_url'] if 'product_url' in df.columns else pd.Series('', index=df.index)
+    return list(zip(df['product_code'], urls.fillna('')))
+
+
+def _cursor_path(out_dir, product_code):
+    return os.path.join(out_dir, CURSOR_DIR, f'{product_code}.json')
+
+
+def load_cursor(out_dir, product_code):
+    """상품별 수집 커서 (없으면 처음부터)"""
+    path = _cursor_path(out_dir, product_code)
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    return {'next_page': 1, 'fetched': 0, 'reviews_done': False, 'detail_done': False}
+
+
+def save_cursor(out_dir, product_code, cursor):
+    """임시 파일 기록 후 교체 (중단 시에도 커서 파일이 깨지지 않음)"""
+    path = _cursor_path(out_dir, product_code)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cursor, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+# =============================================================================
+# 4. 응답 파싱
+# =============================================================================
+
+def parse_review_page(payload, product_code):
+    """
+    리뷰 API 응답 → 리뷰 레코드 리스트
+
+    Returns:
+        tuple: (리뷰 dict 리스트, 전체 리뷰 수)
+    """
+    data = payload.get('data') or {}
+    rows = []
+    for item in data.get('reviewList') or []:
+        row = {'product_code': product_code}
+        row.update({col: item.get(field) for field, col in REVIEW_FIELDS.items()})
+        if row['review_date']:
+            row['review_date'] = str(row['review_date'])[:10]
+        rows.append(row)
+    return rows, int(data.get('totalCount') or 0)
+
+
+def parse_detail(payload, product_code, product_url):
+    """상품 상세 API 응답 → 상세 레코드 (원본 필드 유지)"""
+    record = {'product_code': product_code, 'product_url': product_url}
+    record.update(payload.get('data') or {})
+    return record
+
+# =============================================================================
+# 5. 비동기 수집
+# =============================================================================
+
+async def _get_json(client, limiter, url, params=None):
+    """속도 제한 + 재시도(429/5xx/네트워크 오류, 지수 백오프) GET"""
+    import httpx
+
+    for attempt in range(MAX_RETRIES + 1):
+        await limiter.acquire(url)
+        try:
+            response = await client.get(url, params=params)
+        except httpx.TransportError:
+            if attempt == MAX_RETRIES:
+                raise
+            await asyncio.sleep(0.5 * 2 ** attempt)
+            continue
+
+        if (response.status_code == 429 or response.status_code >= 500) and attempt < MAX_RETRIES:
+            retry_after = response.headers.get('Retry-After', '')
+            await asyncio.sleep(float(retry_after) if retry_after.isdigit() else 0.5 * 2 ** attempt)
+            continue
+        response.raise_for_status()
+        return response.json()
+
+
+async def fetch_product(client, limiter, base_url, product_code, product_url, out_dir, writers,
+                        max_reviews=MAX_REVIEWS, page_size=PAGE_SIZE):
+    """
+    단일 상품의 상세 + 리뷰 페이지를 커서 위치부터 수집
+
+    페이지마다 JSONL에 기록한 뒤 커서를 저장하므로, 중단되어도 다음 실행은
+    마지막으로 저장된 페이지 다음부터 이어서 수집한다.
+
+    Returns:
+        dict: product_code, pages, reviews (이번 실행에서 수집한 양)
+    """
+    cursor = load_cursor(out_dir, product_code)
+    pages = reviews = 0
+
+    if not cursor['detail_done']:
+        payload = await _get_json(client, limiter, base_url + DETAIL_PATH.format(product_code=product_code))
+        writers['details'].write(json.dumps(parse_detail(payload, product_code, product_url),
+                                            ensure_ascii=False) + '\n')
+        writers['details'].flush()
+        cursor['detail_done'] = True
+        save_cursor(out_dir, product_code, cursor)
+
+    while not cursor['reviews_done']:
+        payload = await _get_json(client, limiter, base_url + REVIEW_PATH, params={
+            'page': cursor['next_page'], 'pageLimit': page_size,
+            'reviewSort': '001', 'revwPatrCode': '000', 'saleCmdtid': product_code,
+        })
+        rows, total = parse_review_page(payload, product_code)
+        rows = rows[:max_reviews - cursor['fetched']]
+        if rows:
+            writers['reviews'].write(''.join(json.dumps(r, ensure_ascii=False) + '\n' for r in rows))
+            writers['reviews'].flush()
+
+        cursor['fetched'] += len(rows)
+        cursor['next_page'] += 1
+        cursor['total'] = total
+        cursor['reviews_done'] = (not rows or cursor['fetched'] >= min(total, max_reviews))
+        save_cursor(out_dir, product_code, cursor)
+        pages += 1
+        reviews += len(rows)
+
+    return {'product_code': product_code, 'pages': pages, 'reviews': reviews}
+
+
+async def fetch_all(products, base_url=KYOBO_BASE_URL, out_dir=FETCH_DIR, concurrency=CONCURRENCY,
+                    rate_per_sec=RATE_PER_SEC, max_reviews=MAX_REVIEWS, timeout=20.0):
+    """
+    상품 목록 전체를 동시성 제한 워커로 수집 (하나의 커넥션 풀 공유)
+
+    Returns:
+        list: 상품별 수집 요약 dict (실패 시 error 포함)
+    """
+    import httpx
+
+    os.makedirs(os.path.join(out_dir, CURSOR_DIR), exist_ok=True)
+    queue = asyncio.Queue()
+    for product in products:
+        queue.put_nowait(product)
+
+    limiter = HostRateLimiter(rate_per_sec)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    headers = {'User-Agent': 'Mozilla/5.0 (book-trends review fetcher)', 'Accept': 'application/json'}
+    summaries = []
+
+    with open(os.path.join(out_dir, REVIEWS_JSONL), 'a', encoding='utf-8') as f_reviews, \
+            open(os.path.join(out_dir, DETAILS_JSONL), 'a', encoding='utf-8') as f_details:
+        writers = {'reviews': f_reviews, 'details': f_details}
+
+        async with httpx.AsyncClient(limits=limits, headers=headers, timeout=timeout) as client:
+            async def worker():
+                while True:
+                    try:
+                        product_code, product_url = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+                    try:
+                        summary = await fetch_product(client, limiter, base_url, product_code, product_url,
+                                                      out_dir, writers, max_reviews=max_reviews)
+                    except Exception as e:
+                        summary = {'product_code': product_code, 'pages': 0, 'reviews': 0,
+                                   'error': str(e)[:80]}
+                    summaries.append(summary)
+                    if len(summaries) % 50 == 0 or len(summaries) == len(products):
+                        print(f"  - {len(summaries)}/{len(products)} 상품 처리")
+
+            await asyncio.gather(*(worker() for _ in range(min(concurrency, len(products)) or 1)))
+
+    return summaries
+
+
+def export_reviews_csv(out_dir=FETCH_DIR, out_path=EXPORT_PATH):
+    """
+    누적 JSONL → 리뷰 CSV (재개 시 중복 기록된 페이지는 제거)
+
+    실행마다 같은 파일을 통째로 덮어쓰므로, 수집한 리뷰는 review_aggregation의
+    REVIEW_GLOB(kyobo_reviews_*.csv)에 걸리는 파일 중 이 파일 하나에만 들어간다.
+
+    Returns:
+        str: 저장한 CSV 경로
+    """
+    out_path = out_path or EXPORT_PATH
+    df = pd.read_json(os.path.join(out_dir, REVIEWS_JSONL), lines=True, dtype={'product_code': str})
+    df = df.reindex(columns=REVIEW_COLUMNS).drop_duplicates(
+        subset=['product_code', 'reviewer_id', 'review_date', 'review_content'])
+    tmp_path = out_path + '.tmp'
+    df.to_csv(tmp_path, index=False, encoding='utf-8-sig')
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+def run_fetch(books_path=BOOKS_PATH, base_url=KYOBO_BASE_URL, out_dir=FETCH_DIR, concurrency=CONCURRENCY,
+              rate_per_sec=RATE_PER_SEC, max_reviews=MAX_REVIEWS, limit=None, export_path=None):
+    """
+    books 상품 목록의 리뷰/상세 일괄 수집 (완료 상품은 건너뛰고 미완료 상품은 커서부터 재개)
+
+    Args:
+        books_path: Supabase books CSV (product_code, product_url)
+        base_url: API 기본 URL (로컬 대체 서버 주소로 바꿔 테스트)
+        out_dir: JSONL/커서 저장 디렉토리
+        concurrency: 동시 처리 상품 수 (= 커넥션 풀 크기)
+        rate_per_sec: 호스트별 초당 요청 수
+        max_reviews: 도서당 최대 리뷰 수
+        limit: 앞에서부터 N개 상품만 수집
+        export_path: 리뷰 CSV 저장 경로 (None이면 EXPORT_PATH, 매번 덮어씀)
+
+    Returns:
+        DataFrame: 상품별 수집 요약
+    """
+    print("=" * 80)
+    print("리뷰/도서 상세 비동기 수집 시작")
+    print("=" * 80)
+
+    products = load_products(books_path)[:limit]
+    pending = [(code, url) for code, url in products
+               if not all(load_cursor(out_dir, code)[k] for k in ('reviews_done', 'detail_done'))]
+    print(f"\n상품 {len(products)}개 중 수집 대상 {len(pending)}개 "
+          f"(동시 {concurrency}, 호스트당 {rate_per_sec:g}회/초)")
+
+    started = time.time()
+    summaries = asyncio.run(fetch_all(pending, base_url, out_dir, concurrency, rate_per_sec, max_reviews)) \
+        if pending else []
+    df_summary = pd.DataFrame(summaries, columns=['product_code', 'pages', 'reviews', 'error'])
+
+    elapsed = time.time() - started
+    n_failed = int(df_summary['error'].notna().sum())
+    print(f"\n수집 완료: 리뷰 {int(df_summary['reviews'].sum())}건, 요청 {int(df_summary['pages'].sum())}페이지, "
+          f"{elapsed:.1f}초, 실패 {n_failed}개 (재실행 시 커서부터 재개)")
+
+    if os.path.exists(os.path.join(out_dir, REVIEWS_JSONL)):
+        print(f"✓ 리뷰 CSV 저장: {export_reviews_csv(out_dir, export_path)}")
+    return df_summary
+
+# =============================================================================
+# 6. 로컬 대체 서버 (테스트용)
+# =============================================================================
+
+class StandinHandler(BaseHTTPRequestHandler):
+    """리뷰/상세 API와 같은 응답 형태를 돌려주는 로컬 서버 (상품코드별 결정적 데이터)"""
+
+    protocol_version = 'HTTP/1.1'   # keep-alive
+    latency = 0.0
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+
+        if url.path == REVIEW_PATH:
+            code = query.get('saleCmdtid', [''])[0]
+            page = int(query.get('page', ['1'])[0])
+            size = int(query.get('pageLimit', [str(PAGE_SIZE)])[0])
+            body = {'data': {'reviewList': self._reviews(code, page, size), 'totalCount': self._total(code)}}
+        elif url.path.startswith(DETAIL_PATH.split('{')[0]):
+            code = url.path.rsplit('/', 1)[-1]
+            body = {'data': {'saleCmdtid': code, 'cmdtName': f'도서 {code}', 'revwCount': self._total(code),
+                             'revwRvgrAvg': round(5 + self._seed(code) % 50 / 10, 1)}}
+        else:
+            self.send_error(404)
+            return
+
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+    @staticmethod
+    def _seed(code):
+        return int(hashlib.md5(code.encode('utf-8')).hexdigest()[:8], 16)
+
+    @classmethod
+    def _total(cls, code):
+        return cls._seed(code) % 400
+
+    def _reviews(self, code, page, size):
+        total = self._total(code)
+        start = (page - 1) * size
+        emotions = ['쉬웠어요', '도움돼요', '최고예요', '추천해요', '집중돼요']
+        return [{
+            'revwCntt': f'{code} 리뷰 {i}',
+            'revwRvgr': 1 + (self._seed(code) + i) % 5,
+            'revwEmtnKywrName': emotions[i % len(emotions)],
+            'mmbrId': f'u{i:04d}**',
+            'cretDttm': (date(2025, 1, 1) + timedelta(days=(self._seed(code) + i * 3) % 365)).isoformat() + ' 10:00:00',
+            'recmCont': i % 7,
+            'cmntCont': i % 3,
+        } for i in range(start, min(start + size, total))]
+
+
+def start_standin_server(host='127.0.0.1', port=0, latency=0.0):
+    """
+    로컬 대체 서버를 백그라운드 스레드로 실행
+
+    Args:
+        port: 0이면 빈 포트 자동 선택
+        latency: 요청당 인위적 지연 (초)
+
+    Returns:
+        tuple: (server, base_url) — 종료는 server.shutdown()
+    """
+    handler = type('Handler', (StandinHandler,), {'latency': latency})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://{host}:{server.server_address[1]}'
+
+
+if __name__ == "__main__":
+    run_fetch()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+카테고리별 주간 판매 점수 예측
+시차 바이럴 지수/추세 피처 + 카테고리별 LightGBM 모델 (프로세스 풀 병렬 학습, 모델 캐시)
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from market_panel import load_market_panel, VIRAL_PATH, SALES_PATH
+
+# =============================================================================
+# 1. 설정
+# =============================================================================
+
+FORECAST_CACHE_DIR = 'analysis/prediction/models/forecast_cache'
+FORECAST_PATH = 'analysis/prediction/weekly_sales_forecast.csv'
+
+# 뉴스 → 베스트셀러 1~3주 시차, 전주 판매점수(y_lag1)
+VIRAL_LAGS = (1, 2, 3)
+SALES_LAGS = (1, 2)
+
+MIN_TRAIN_ROWS = 8
+FULL_ROUNDS = 200
+WARM_START_ROUNDS = 20
+WARM_START_WINDOW = 26  # 웜스타트 시 최근 N주만 사용
+MAX_WARM_STARTS = 8     # 연속 웜스타트 N회 후 전체 재학습 (트리 누적/최근 구간 편향 방지)
+
+LGB_PARAMS = {
+    'objective': 'regression',
+    'learning_rate': 0.05,
+    'num_leaves': 7,
+    'min_data_in_leaf': 3,
+    'feature_fraction': 0.9,
+    'num_threads': 1,  # 병렬화는 카테고리 단위 프로세스로
+    'verbose': -1,
+}
+
+# =============================================================================
+# 2. 피처 생성
+# =============================================================================
+
+def _shift(arr, lag, width):
+    """[카테고리 × T] 배열을 lag 만큼 뒤로 민 [카테고리 × width] 배열 (앞부분 NaN)"""
+    out = np.full((arr.shape[0], width), np.nan, dtype=np.float32)
+    n = min(arr.shape[1], width - lag)
+    out[:, lag:lag + n] = arr[:, :n]
+    return out
+
+
+def build_lag_features(panel, viral_lags=VIRAL_LAGS, sales_lags=SALES_LAGS):
+    """
+    패널에서 시차 피처 텐서 생성
+
+    Args:
+        panel: viral_index, viral_index_smoothed, sales_score 지표를 가진 MarketPanel
+        viral_lags: 바이럴 지수 시차 (주)
+        sales_lags: 판매 점수 시차 (주)
+
+    Returns:
+        tuple: (X [카테고리 × (T+1) × 피처], y [카테고리 × T], 피처명 리스트)
+               X의 마지막 기간(T)은 다음 주 예측용 피처
+    """
+    width = len(panel.periods) + 1
+    viral = panel.values['viral_index']
+    smoothed = panel.values['viral_index_smoothed']
+    sales = panel.values['sales_score']
+
+    features, names = [], []
+    for lag in viral_lags:
+        features.append(_shift(viral, lag, width))
+        names.append(f'viral_lag{lag}')
+        features.append(_shift(smoothed, lag, width))
+        names.append(f'viral_smoothed_lag{lag}')
+
+    # 바이럴 추세: 평활 지수의 직전 주 변화량
+    features.append(_shift(smoothed, 1, width) - _shift(smoothed, 2, width))
+    names.append('viral_trend')
+
+    for lag in sales_lags:
+        features.append(_shift(sales, lag, width))
+        names.append(f'sales_lag{lag}')
+
+    X = np.stack(features, axis=-1)
+    return X, sales, names
+
+# =============================================================================
+# 3. 카테고리별 학습 (워커)
+# =============================================================================
+
+def _data_hash(X, y):
+    """입력 데이터 + 학습 설정 해시 (캐시 키)"""
+    h = hashlib.sha256()
+    h.update(np.ascontiguousarray(X, dtype=np.float32).tobytes())
+    h.update(np.ascontiguousarray(y, dtype=np.float32).tobytes())
+    h.update(json.dumps([LGB_PARAMS, FULL_ROUNDS, X.shape[1]], sort_keys=True).encode())
+    return h.hexdigest()[:20]
+
+
+def _fit_category(task):
+    """
+    단일 카테고리 모델 학습/재사용 후 다음 주 예측
+
+    - 동일 입력 해시 모델이 있으면 그대로 사용 (cached)
+    - 기존 학습 데이터가 현재 데이터의 앞부분과 같으면 신규 주차만 추가 학습 (warm)
+    - 그 외, 또는 연속 웜스타트가 MAX_WARM_STARTS회에 이르면 전체 재학습 (full)
+    - 새 모델을 저장하면 이전 모델 파일은 삭제
+    """
+    import lightgbm as lgb
+
+    category, X, y, x_next, feature_names, cache_dir = task
+    key = _data_hash(X, y)
+    model_path = os.path.join(cache_dir, f'{key}.txt')
+    manifest_path = os.path.join(cache_dir, f"{category.replace('/', '_')}.json")
+
+    if os.path.exists(model_path):
+        booster = lgb.Booster(model_file=model_path)
+        mode = 'cached'
+    else:
+        manifest = {}
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding='utf-8') as f:
+                manifest = json.load(f)
+
+        prev_rows = manifest.get('n_rows', 0)
+        prev_path = os.path.join(cache_dir, f"{manifest.get('hash')}.txt")
+        warm_starts = manifest.get('warm_starts', 0)
+        can_warm_start = (0 < prev_rows < len(y)
+                          and warm_starts < MAX_WARM_STARTS
+                          and os.path.exists(prev_path)
+                          and _data_hash(X[:prev_rows], y[:prev_rows]) == manifest.get('hash'))
+
+        if can_warm_start:
+            start = max(0, len(y) - WARM_START_WINDOW)
+            data = lgb.Dataset(X[start:], y[start:], feature_name=feature_names, free_raw_data=True)
+            booster = lgb.train(LGB_PARAMS, data, num_boost_round=WARM_START_ROUNDS, init_model=prev_path)
+            mode = 'warm'
+            warm_starts += 1
+        else:
+            data = lgb.Dataset(X, y, feature_name=feature_names, free_raw_data=True)
+            booster = lgb.train(LGB_PARAMS, data, num_boost_round=FULL_ROUNDS)
+            mode = 'full'
+            warm_starts = 0
+
+        booster.save_model(model_path)
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump({'category': category, 'hash': key, 'n_rows': len(y), 'warm_starts': warm_starts},
+                      f, ensure_ascii=False)
+
+        # 대체된 이전 모델 정리 (manifest 갱신 후 삭제해 중단 시에도 참조가 끊기지 않게)
+        if os.path.exists(prev_path) and prev_path != model_path:
+            os.remove(prev_path)
+
+    forecast = float(booster.predict(x_next.reshape(1, -1))[0])
+    return {'category': category, 'forecast_sales_score': round(forecast, 4),
+            'n_train': len(y), 'mode': mode}
+
+# =============================================================================
+# 4. 전체 카테고리 예측
+# =============================================================================
+
+def forecast_sales(panel, cache_dir=FORECAST_CACHE_DIR, max_workers=None):
+    """
+    카테고리별 다음 주 판매 점수 예측 (프로세스 풀 병렬)
+
+    Args:
+        panel: viral_index, viral_index_smoothed, sales_score 지표를 가진 MarketPanel
+        cache_dir: 모델 캐시 디렉토리
+        max_workers: 프로세스 수 (None이면 CPU 코어 수)
+
+    Returns:
+        DataFrame: category, next_period_after, forecast_sales_score, n_train, mode
+    """
+    print("\n" + "=" * 80)
+    print("카테고리별 판매 점수 예측")
+    print("=" * 80)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    X, y, feature_names = build_lag_features(panel)
+    min_start = max(max(VIRAL_LAGS) + 1, max(SALES_LAGS))
+
+    tasks = []
+    for code, category in enumerate(panel.categories):
+        # 관측된 판매 점수 주차만 학습 (피처 결측은 LightGBM이 처리)
+        rows = np.flatnonzero(~np.isnan(y[code]))
+        rows = rows[rows >= min_start]
+        if len(rows) < MIN_TRAIN_ROWS:
+            print(f"  - {category}: 학습 데이터 부족 ({len(rows)}주), 건너뜀")
+            continue
+        tasks.append((str(category), X[code, rows], y[code, rows], X[code, -1],
+                      feature_names, cache_dir))
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        results = list(pool.map(_fit_category, tasks))
+
+    df_forecast = pd.DataFrame(results)
+    if not df_forecast.empty:
+        df_forecast.insert(1, 'next_period_after', str(panel.periods[-1]))
+        print(f"\n[예측 결과]")
+        print(df_forecast.to_string(index=False))
+        print(f"\n학습 모드: {df_forecast['mode'].value_counts().to_dict()}")
+
+    return df_forecast
+
+
+def main(viral_path, sales_path, out_path=FORECAST_PATH, max_workers=None):
+    panel = load_market_panel(viral_path, sales_path)
+    df_forecast = forecast_sales(panel, max_workers=max_workers)
+    if df_forecast.empty:
+        print("\n⚠️  예측 가능한 카테고리가 없습니다.")
+        return df_forecast
+
+    os.makedirs(os.path.dirname(out_path) or '.', exist_ok=True)
+    df_forecast.to_csv(out_path, index=False, encoding='utf-8-sig')
+    print(f"\n✓ 예측 결과 저장: {out_path}")
+    return df_forecast
+
+
+if __name__ == "__main__":
+    main(VIRAL_PATH, SALES_PATH)
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+지역(geo) × 연도 샤드 병렬 수집/분석
+샤드별 독립 프로세스 실행 → 파티션 출력(geo=…/year=…) → 샤드 간 비교 테이블 병합
+"""
+
+import os
+import glob
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+# =============================================================================
+# 1. 설정
+# =============================================================================
+
+SHARD_DIR = 'analysis/shards'
+DEFAULT_GEOS = ['KR', 'KR-11', 'KR-26', 'KR-41']  # 전국, 서울, 부산, 경기
+DEFAULT_YEARS = [2024, 2025]
+
+# Google Trends 요청 예산 (전체 프로세스 합산, 분당 요청 수)
+REQUESTS_PER_MINUTE = 60
+MIN_SLEEP_SEC = 2
+# 키워드 1개당 실제 Google 요청 수: build_payload(토큰) + interest_over_time / related_queries
+REQUESTS_PER_KEYWORD = 2
+
+SUCCESS_MARKER = '_SUCCESS'
+
+# =============================================================================
+# 2. 샤드 계획
+# =============================================================================
+
+def plan_shards(geos=DEFAULT_GEOS, years=DEFAULT_YEARS):
+    """(geo, year) 샤드 목록"""
+    return [(geo, int(year)) for geo in geos for year in years]
+
+
+def shard_path(out_dir, geo, year):
+    """샤드 파티션 디렉토리 (geo=KR-11/year=2024)"""
+    return os.path.join(out_dir, f'geo={geo}', f'year={year}')
+
+
+def plan_workers(n_shards, max_workers=None, requests_per_minute=REQUESTS_PER_MINUTE):
+    """
+    CPU 코어 수와 요청 예산으로 워커 수 및 워커별 키워드 간 대기 결정
+
+    키워드 하나가 REQUESTS_PER_KEYWORD번 요청하므로, 워커당 요청률은
+    REQUESTS_PER_KEYWORD × 60 / sleep_sec (회/분)로 계산한다.
+
+    Returns:
+        tuple: (워커 수, 워커별 키워드 간 대기 초)
+    """
+    budget_workers = max(1, int(requests_per_minute * MIN_SLEEP_SEC / (60 * REQUESTS_PER_KEYWORD)))
+    workers = min(n_shards, max_workers or os.cpu_count() or 1, budget_workers)
+    workers = max(1, workers)
+    # 전체 요청률이 예산을 넘지 않도록 워커 수에 비례해 간격 확대
+    sleep_sec = max(MIN_SLEEP_SEC, workers * 60 * REQUESTS_PER_KEYWORD / requests_per_minute)
+    return workers, sleep_sec
+
+# =============================================================================
+# 3. 샤드 실행 (워커)
+# =============================================================================
+
+def run_shard(task):
+    """
+    단일 (geo, year) 샤드 수집 후 파티션 디렉토리에 저장
+
+    Args:
+        task: (geo, year, out_dir, sleep_sec, with_econ) 튜플
+
+    Returns:
+        dict: 샤드 요약 (geo, year, rows, seconds, status[, missing])
+              모든 키워드가 수집된 경우에만 _SUCCESS를 기록한다.
+    """
+    geo, year, out_dir, sleep_sec, with_econ = task
+    from new_trends_crawling import collect_google_trends, KEYWORDS_MAP
+
+    started = time.time()
+    path = shard_path(out_dir, geo, year)
+    os.makedirs(path, exist_ok=True)
+    # 재실행(force 등) 중 실패해도 이전 완료 표시가 남지 않도록 먼저 제거
+    marker = os.path.join(path, SUCCESS_MARKER)
+    if os.path.exists(marker):
+        os.remove(marker)
+
+    df_trends = collect_google_trends(start_date=f'{year}-01-01', end_date=f'{year}-12-31',
+                                      geo=geo, sleep_sec=sleep_sec)
+    if df_trends.empty:
+        return {'geo': geo, 'year': year, 'rows': 0, 'seconds': round(time.time() - started, 1),
+                'status': 'empty'}
+
+    # 오류/빈 응답으로 빠진 키워드 (collect_google_trends는 키워드별 오류를 건너뜀)
+    expected = [kw for keywords in KEYWORDS_MAP.values() for kw in keywords]
+    missing = [kw for kw in expected if kw not in set(df_trends['keyword'])]
+
+    df_trends.assign(geo=geo, year=year).to_csv(os.path.join(path, 'trends.csv'),
+                                                index=False, encoding='utf-8-sig')
+
+    if with_econ:
+        from google_trends_econ_new import EconomyTrendsAnalyzer
+
+        # EconomyTrendsAnalyzer는 uniform(1.5, 2.5) × sleep_scale초를 쉬므로, 배율을 sleep_sec / 2로 두면
+        # 평균만 계획 간격과 같고 최소 0.75 × sleep_sec까지 짧아짐 → 하한(1.5)이 계획 간격이 되도록 배율 설정
+        analyzer = EconomyTrendsAnalyzer(geo=geo, sleep_scale=sleep_sec / 1.5)
+        results = analyzer.analyze_year_by_month(year=year, analyze_full_year=True)
+        if results:
+            analyzer.save_results_to_csv(results, os.path.join(path, 'economy_trends.csv'))
+
+    summary = {'geo': geo, 'year': year, 'rows': len(df_trends),
+               'seconds': round(time.time() - started, 1), 'status': 'ok'}
+    if missing:
+        # 일부 키워드 누락: 완료 표시 없이 남겨 다음 실행에서 샤드 전체를 다시 수집
+        summary.update(status='partial', missing=missing)
+        return summary
+
+    with open(marker, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False)
+    return summary
+
+
+def run_shards(geos=DEFAULT_GEOS, years=DEFAULT_YEARS, out_dir=SHARD_DIR, max_workers=None,
+               requests_per_minute=REQUESTS_PER_MINUTE, with_econ=False, force=False):
+    """
+    (geo, year) 샤드를 독립 프로세스로 병렬 실행 (완료 샤드는 건너뜀)
+
+    Args:
+        geos: 지역 코드 리스트
+        years: 연도 리스트
+        out_dir: 파티션 출력 루트
+        max_workers: 최대 프로세스 수 (None이면 CPU 코어 수)
+        requests_per_minute: 전체 요청 예산 (분당)
+        with_econ: 월별 경제 트렌드 키워드(EconomyTrendsAnalyzer)도 수집
+        force: 완료된 샤드도 재실행
+
+    Returns:
+        DataFrame: 샤드별 실행 요약
+    """
+    print("=" * 80)
+    print("샤드 병렬 수집 시작")
+    print("=" * 80)
+
+    shards = plan_shards(geos, years)
+    pending = [(geo, year) for geo, year in shards
+               if force or not os.path.exists(os.path.join(shard_path(out_dir, geo, year), SUCCESS_MARKER))]
+    print(f"\n전체 샤드 {len(shards)}개, 실행 대상 {len(pending)}개")
+    if not pending:
+        return pd.DataFrame()
+
+    workers, sleep_sec = plan_workers(len(pending), max_workers, requests_per_minute)
+    print(f"워커 {workers}개, 워커별 키워드 간격 {sleep_sec:.1f}초 "
+          f"(키워드당 {REQUESTS_PER_KEYWORD}회 요청, 예산 {requests_per_minute}회/분)")
+
+    tasks = [(geo, year, out_dir, sleep_sec, with_econ) for geo, year in pending]
+    summaries = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run_shard, task): task for task in tasks}
+        for future in as_completed(futures):
+            geo, year = futures[future][:2]
+            try:
+                summary = future.result()
+            except Exception as e:
+                summary = {'geo': geo, 'year': year, 'rows': 0, 'seconds': None,
+                           'status': f'error: {str(e)[:50]}'}
+            print(f"  ✓ [{geo} / {year}] {summary['status']} ({summary['rows']}행)")
+            if summary.get('missing'):
+                print(f"    ⚠️  누락 키워드 {len(summary['missing'])}개: {', '.join(summary['missing'])} (다음 실행에서 재수집)")
+            summaries.append(summary)
+
+    return pd.DataFrame(summaries)
+
+# =============================================================================
+# 4. 샤드 병합 및 비교 테이블
+# =============================================================================
+
+def merge_shards(out_dir=SHARD_DIR):
+    """
+    파티션 출력을 병합해 샤드 간 비교 테이블 생성
+
+    Args:
+        out_dir: 파티션 출력 루트
+
+    Returns:
+        dict: merged(전체 long), category_by_shard(카테고리 × geo/year 평균 지수),
+              yoy(geo × 카테고리 전년 대비 변화), geo_vs_national(전국 대비 월별 순위 상관)
+    """
+    print("\n" + "=" * 80)
+    print("샤드 결과 병합")
+    print("=" * 80)
+
+    files = sorted(glob.glob(os.path.join(out_dir, 'geo=*', 'year=*', 'trends.csv')))
+    if not files:
+        print("\n⚠️  병합할 샤드 결과가 없습니다.")
+        return {}
+
+    df = pd.concat([pd.read_csv(f, encoding='utf-8-sig') for f in files], ignore_index=True)
+    df['month'] = df['month'].astype(str)
+    df['month_of_year'] = df['month'].str[5:7]
+    print(f"\n샤드 {len(files)}개, 총 {len(df)}행")
+
+    # 카테고리 × (geo, year) 평균 지수
+    category_by_shard = df.pivot_table(index='category', columns=['geo', 'year'],
+                                       values='index', aggfunc='mean').round(1)
+
+    # geo × 카테고리 연도별 평균 및 전년 대비 변화
+    yearly = df.groupby(['geo', 'category', 'year'])['index'].mean().unstack('year')
+    yoy = yearly.diff(axis=1).iloc[:, 1:].add_prefix('yoy_')
+    yoy = pd.concat([yearly.round(1), yoy.round(1)], axis=1)
+
+    # 지역별 월별 카테고리 지수와 전국(KR) 지수의 순위 상관
+    monthly = df.groupby(['geo', 'year', 'category', 'month_of_year'])['index'].mean()
+    rows = []
+    if 'KR' in df['geo'].unique():
+        national = monthly.xs('KR', level='geo')
+        for (geo, year, category), series in monthly.groupby(level=['geo', 'year', 'category']):
+            if geo == 'KR' or (year, category) not in national.droplevel('month_of_year').index:
+                continue
+            regional = series.droplevel(['geo', 'year', 'category'])
+            base = national.loc[(year, category)]
+            common = regional.index.intersection(base.index)
+            if len(common) < 3:
+                continue
+            rows.append({'geo': geo, 'year': year, 'category': category,
+                         'spearman_vs_KR': round(regional.loc[common].corr(base.loc[common], method='spearman'), 3),
+                         'mean_diff_vs_KR': round(regional.loc[common].mean() - base.loc[common].mean(), 1)})
+    geo_vs_national = pd.DataFrame(rows)
+
+    df.to_csv(os.path.join(out_dir, 'merged_trends.csv'), index=False, encoding='utf-8-sig')
+    category_by_shard.to_csv(os.path.join(out_dir, 'comparison_category_by_shard.csv'), encoding='utf-8-sig')
+    yoy.to_csv(os.path.join(out_dir, 'comparison_yoy.csv'), encoding='utf-8-sig')
+    if not geo_vs_national.empty:
+        geo_vs_national.to_csv(os.path.join(out_dir, 'comparison_geo_vs_national.csv'),
+                               index=False, encoding='utf-8-sig')
+
+    econ_files = sorted(glob.glob(os.path.join(out_dir, 'geo=*', 'year=*', 'economy_trends.csv')))
+    if econ_files:
+        frames = []
+        for f in econ_files:
+            parts = f.split(os.sep)
+            geo = parts[-3].split('=', 1)[1]
+            year = parts[-2].split('=', 1)[1]
+            frames.append(pd.read_csv(f, encoding='utf-8-sig').assign(geo=geo, year=year))
+        pd.concat(frames, ignore_index=True).to_csv(os.path.join(out_dir, 'merged_economy_trends.csv'),
+                                                    index=False, encoding='utf-8-sig')
+
+    print(f"\n[카테고리 × 샤드 평균 지수]")
+    print(category_by_shard)
+    print(f"\n✓ 비교 테이블 저장: {out_dir}")
+
+    return {'merged': df, 'category_by_shard': category_by_shard, 'yoy': yoy,
+            'geo_vs_national': geo_vs_national}
+
+
+if __name__ == "__main__":
+    run_shards()
+    merge_shards()
@@ -0,0 +1,498 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+경제/경영 도서 트렌드 분석 - 통합 CLI
+collect / shard / train-classifier / classify / correlate / xcorr / events / forecast / fetch-reviews / reviews / render / refresh / serve / sync / insights 서브커맨드
+
+pandas, scipy, pytrends, plotly 등 무거운 의존성은 각 서브커맨드 안에서만 import 한다.
+(--help, insights 등 가벼운 명령은 표준 라이브러리만으로 실행)
+
+import 시간 측정:
+    python -X importtime trend_cli.py insights 2> importtime.log
+    book-trends --timing insights
+"""
+
+import argparse
+import os
+import sys
+import time
+
+_START = time.perf_counter()
+
+TRENDS_FILE = 'new_trends_crawling.csv'
+OUTPUT_PREFIX = 'new_trends_crawling'
+BOOKS_FILE = 'Supabase Snippet Retrieve all books.csv'
+
+# =============================================================================
+# 1. 서브커맨드
+# =============================================================================
+
+def cmd_collect(args):
+    """Google Trends 키워드 지수 수집 (또는 월별 경제 트렌드 키워드 수집)"""
+    if args.econ_year:
+        from google_trends_econ_new import EconomyTrendsAnalyzer
+
+        analyzer = EconomyTrendsAnalyzer(geo=args.geo)
+        results = analyzer.analyze_year_by_month(year=args.econ_year, analyze_full_year=True, top_n=args.top_n)
+        if not results:
+            print("\n❌ 수집된 데이터가 없습니다.")
+            return 1
+        analyzer.save_results(results, f"economy_trends_{args.econ_year}.json")
+        analyzer.save_results_to_csv(results, f"economy_trends_{args.econ_year}.csv")
+        return 0
+
+    if args.daily:
+        from trends_stitching import stitch_daily_trends
+
+        df_daily = stitch_daily_trends(start=args.start, end=args.daily_end, geo=args.geo,
+                                       store_dir=args.store_dir)
+        return 0 if not df_daily.empty else 1
+
+    from new_trends_crawling import collect_google_trends
+
+    df_trends = collect_google_trends(start_date=args.start, end_date=args.end, geo=args.geo)
+    if df_trends.empty:
+        print("\n⚠️  Google Trends 데이터 수집 실패.")
+        return 1
+
+    df_trends.to_csv(args.out, index=False, encoding='utf-8-sig')
+    print(f"\n✓ Google Trends 데이터 저장: {args.out}")
+    return 0
+
+
+def cmd_shard(args):
+    """(geo, year) 샤드 병렬 수집 + 샤드 간 비교 테이블 병합"""
+    import shard_runner
+
+    if not args.merge_only:
+        shard_runner.run_shards(geos=args.geos, years=args.years, out_dir=args.out_dir,
+                                max_workers=args.workers, requests_per_minute=args.rpm,
+                                with_econ=args.econ, force=args.force)
+    return 0 if shard_runner.merge_shards(args.out_dir) else 1
+
+
+def cmd_train_classifier(args):
+    """라벨된 도서/뉴스 CSV로 ML 카테고리 분류기 학습"""
+    import pandas as pd
+    from news_classifier import train_classifier, save_classifier
+
+    df_labeled = pd.read_csv(args.input, encoding='utf-8-sig')
+    bundle = train_classifier(df_labeled, label_col=args.label_col, text_cols=args.text_cols,
+                              epochs=args.epochs)
+    save_classifier(bundle, args.model)
+    return 0
+
+
+def cmd_classify(args):
+    """베스트셀러/뉴스 CSV에 카테고리 컬럼 추가 (규칙 기반 또는 ML, 입력 파일은 보존)"""
+    out = args.out or f'{os.path.splitext(args.input)[0]}_classified.csv'
+    if os.path.abspath(out) == os.path.abspath(args.input):
+        print("❌ --out이 입력 파일과 같습니다. 다른 경로를 지정하세요.")
+        return 1
+
+    if args.method == 'ml':
+        from news_classifier import load_classifier, classify_csv_stream
+
+        bundle = load_classifier(args.model)
+        classify_csv_stream(args.input, out, bundle, threshold=args.threshold)
+        return 0
+
+    import pandas as pd
+    from new_trends_crawling import classify_bestseller_data
+
+    df_bestseller = pd.read_csv(args.input, encoding='utf-8-sig')
+    df_bestseller = classify_bestseller_data(df_bestseller)
+
+    df_bestseller.to_csv(out, index=False, encoding='utf-8-sig')
+    print(f"\n✓ 분류 결과 저장: {out}")
+    return 0
+
+
+def cmd_correlate(args):
+    """트렌드 지수 vs 월별 점유율 상관분석 + 인사이트 저장"""
+    import pandas as pd
+    from market_panel import build_trend_share_panel
+    from new_trends_crawling import (classify_bestseller_data, aggregate_monthly_share,
+                                     calculate_new_entries, analyze_correlation, generate_insights)
+
+    df_trends = pd.read_csv(args.trends, encoding='utf-8-sig')
+    df_bestseller = pd.read_csv(args.bestseller, encoding='utf-8-sig')
+    df_trends['month'] = df_trends['month'].astype(str)
+    df_bestseller['month'] = df_bestseller['month'].astype(str)
+    if 'category' not in df_bestseller.columns:
+        df_bestseller = classify_bestseller_data(df_bestseller)
+
+    df_share = aggregate_monthly_share(df_bestseller)
+    df_new_entries = calculate_new_entries(df_bestseller)
+
+    panel = build_trend_share_panel(df_trends, df_share)
+    df_correlation = analyze_correlation(df_trends, df_share, panel=panel)
+
+    prefix = args.out_prefix
+    df_share.to_csv(f'{prefix}_share.csv', encoding='utf-8-sig')
+    if not df_new_entries.empty:
+        df_new_entries.to_csv(f'{prefix}_new_entries.csv', encoding='utf-8-sig')
+
+    if df_correlation.empty:
+        print("\n⚠️  상관분석 결과 없음")
+        return 1
+
+    df_correlation.to_csv(f'{prefix}_correlation.csv', index=False, encoding='utf-8-sig')
+    insights = generate_insights(df_correlation, df_share)
+    with open(f'{prefix}_insights.txt', 'w', encoding='utf-8') as f:
+        f.write('\n'.join(insights) + '\n')
+
+    print(f"\n✓ 결과 저장: {prefix}_correlation.csv, {prefix}_share.csv, {prefix}_insights.txt")
+    return 0
+
+
+def cmd_xcorr(args):
+    """일별 키워드 × 카테고리 교차상관 시차 프로파일 (FFT)"""
+    import pandas as pd
+    from cross_correlation import analyze_lag_profiles
+
+    df_x = pd.read_csv(args.leading, encoding='utf-8-sig')
+    df_y = pd.read_csv(args.lagging, encoding='utf-8-sig')
+    try:
+        df_profiles, df_peaks = analyze_lag_profiles(df_x, df_y, max_lag=args.max_lag,
+                                                     x_key=args.x_key, y_key=args.y_key, geo=args.geo)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    if df_peaks.empty:
+        return 1
+
+    prefix = args.out_prefix
+    df_profiles.to_csv(f'{prefix}_lag_profiles.csv', index=False, encoding='utf-8-sig')
+    df_peaks.to_csv(f'{prefix}_lag_peaks.csv', index=False, encoding='utf-8-sig')
+    print(f"\n✓ 결과 저장: {prefix}_lag_profiles.csv, {prefix}_lag_peaks.csv")
+    return 0
+
+
+def cmd_events(args):
+    """바이럴 급등 이벤트 → 판매 반응 이벤트 스터디"""
+    import market_panel
+    import event_study
+
+    panel = market_panel.load_market_panel(args.viral or market_panel.VIRAL_PATH,
+                                           args.sales or market_panel.SALES_PATH,
+                                           review_path=args.reviews)
+    result = event_study.run_event_study(panel, method=args.method, threshold=args.threshold,
+                                         pre=args.pre, post=args.post, response_metric=args.response,
+                                         min_gap=args.min_gap, out_dir=args.out_dir)
+    return 0 if not result['events'].empty else 1
+
+
+def cmd_forecast(args):
+    """카테고리별 다음 주 판매 점수 예측 (시차 바이럴 피처 + LightGBM)"""
+    import market_panel
+    import sales_forecast
+
+    df_forecast = sales_forecast.main(args.viral or market_panel.VIRAL_PATH,
+                                      args.sales or market_panel.SALES_PATH,
+                                      out_path=args.out, max_workers=args.workers)
+    return 0 if not df_forecast.empty else 1
+
+
+def cmd_fetch_reviews(args):
+    """books 상품 목록의 리뷰/도서 상세 비동기 일괄 수집 (커서부터 재개)"""
+    import review_fetcher
+
+    base_url, server = args.base_url, None
+    if args.standin:
+        server, base_url = review_fetcher.start_standin_server(latency=args.standin_latency)
+        print(f"로컬 대체 서버: {base_url}")
+    try:
+        df_summary = review_fetcher.run_fetch(
+            books_path=args.books, base_url=base_url, out_dir=args.out_dir,
+            concurrency=args.concurrency, rate_per_sec=args.rate, max_reviews=args.max_reviews,
+            limit=args.limit, export_path=args.export)
+    finally:
+        if server:
+            server.shutdown()
+    return 0 if df_summary.empty or df_summary['error'].isna().all() else 1
+
+
+def cmd_reviews(args):
+    """리뷰 파일 스트리밍 → 카테고리 주간 리뷰 신호 (변경 파일만 재집계)"""
+    import market_panel
+    import review_aggregation
+
+    signals, _, _ = review_aggregation.update_review_signals(
+        review_files=args.files or None, books_path=args.books, lookup_path=args.lookup,
+        sales_path=args.sales or market_panel.SALES_PATH, out_dir=args.out_dir,
+        chunk_size=args.chunk_size, ymw_format=args.ymw_format)
+    return 0 if not signals.empty else 1
+
+
+def cmd_render(args):
+    """카테고리별 뉴스 vs 판매 추이 대시보드(HTML) 생성"""
+    import visualize_market_trends as vmt
+
+    vmt.VIRAL_PATH = args.viral or vmt.VIRAL_PATH
+    vmt.SALES_PATH = args.sales or vmt.SALES_PATH
+    vmt.SAVE_PATH = args.out_dir or vmt.SAVE_PATH
+    vmt.create_market_trend_dashboard()
+    return 0
+
+
+def cmd_refresh(args):
+    """변경된 입력만 반영해 리뷰 신호/대시보드 증분 갱신 (--watch: 주기적 확인)"""
+    import market_panel
+    import refresh
+    import visualize_market_trends as vmt
+
+    vmt.SAVE_PATH = args.out_dir or vmt.SAVE_PATH
+    kwargs = dict(viral_path=args.viral or market_panel.VIRAL_PATH,
+                  sales_path=args.sales or market_panel.SALES_PATH,
+                  books_path=args.books if os.path.exists(args.books) else None,
+                  review_lookup=args.lookup, force=args.force)
+    if args.watch:
+        refresh.watch(interval=args.interval, **kwargs)
+    else:
+        result = refresh.refresh_once(**kwargs)
+        if not result['changed_files']:
+            print("변경된 입력이 없습니다.")
+    return 0
+
+
+def cmd_serve(args):
+    """로컬 대시보드 API 서버 실행 (--bench: 부하 테스트 후 종료)"""
+    import market_panel
+    import dashboard_server
+
+    data = dashboard_server.DashboardData(args.viral or market_panel.VIRAL_PATH,
+                                          args.sales or market_panel.SALES_PATH,
+                                          review_path=args.reviews, prefix=args.prefix)
+    if args.bench:
+        dashboard_server.run_bench(data, requests=args.bench_requests, concurrency=args.bench_concurrency)
+    else:
+        dashboard_server.serve(data, host=args.host, port=args.port)
+    return 0
+
+
+def cmd_sync(args):
+    """Supabase books 테이블을 로컬 CSV로 동기화"""
+    import csv
+    from dotenv import load_dotenv
+    from supabase import create_client
+
+    load_dotenv()
+    url = os.environ.get('SUPABASE_URL')
+    key = os.environ.get('SUPABASE_KEY')
+    if not url or not key:
+        print("❌ SUPABASE_URL / SUPABASE_KEY 환경변수가 필요합니다 (.env 지원).")
+        return 1
+
+    client = create_client(url, key)
+    rows = []
+    page_size = 1000
+    while True:
+        # Supabase는 요청당 최대 1000행 → range 페이징
+        response = (client.table(args.table).select('*')
+                    .range(len(rows), len(rows) + page_size - 1).execute())
+        rows.extend(response.data)
+        print(f"  - {len(rows)}행 수신")
+        if len(response.data) < page_size:
+            break
+
+    if not rows:
+        print("⚠️  동기화할 데이터가 없습니다.")
+        return 1
+
+    with open(args.out, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+    print(f"\n✓ {args.table} 테이블 {len(rows)}행 저장: {args.out}")
+    return 0
+
+
+def cmd_insights(args):
+    """저장된 인사이트 출력 (무거운 의존성 없음)"""
+    path = f'{args.prefix}_insights.txt'
+    if not os.path.exists(path):
+        print(f"⚠️  {path} 파일이 없습니다. 먼저 correlate를 실행하세요.")
+        return 1
+
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            print(line.rstrip('\n'))
+    return 0
+
+# =============================================================================
+# 2. 인자 파서
+# =============================================================================
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='book-trends',
+        description='경제/경영 도서 트렌드 영향 분석 CLI'
+    )
+    parser.add_argument('--timing', action='store_true',
+                        help='실행 시간(import 포함)을 stderr로 출력')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('collect', help='Google Trends 데이터 수집')
+    p.add_argument('--start', default='2024-01-01', help='시작 날짜 (YYYY-MM-DD)')
+    p.add_argument('--end', default='2025-01-31', help='종료 날짜 (YYYY-MM-DD)')
+    p.add_argument('--out', default=TRENDS_FILE, help='저장 CSV 경로')
+    p.add_argument('--econ-year', type=int, help='지정 시 해당 연도 월별 경제 트렌드 키워드 수집')
+    p.add_argument('--top-n', type=int, default=30, help='월별 수집 키워드 수 (--econ-year)')
+    p.add_argument('--daily', action='store_true', help='겹침 윈도우 스티칭으로 일별 시계열 수집 (신규 윈도우만 요청)')
+    p.add_argument('--daily-end', help='일별 수집 종료일 (기본: 어제)')
+    p.add_argument('--geo', default='KR', help='지역 코드 (KR, KR-11 등)')
+    p.add_argument('--store-dir', default='analysis/trends_daily', help='일별 윈도우/스티칭 결과 저장 디렉토리')
+    p.set_defaults(func=cmd_collect)
+
+    p = sub.add_parser('shard', help='지역 × 연도 샤드 병렬 수집 및 비교')
+    p.add_argument('--geos', nargs='+', default=['KR', 'KR-11', 'KR-26', 'KR-41'], help='지역 코드')
+    p.add_argument('--years', nargs='+', type=int, default=[2024, 2025], help='연도')
+    p.add_argument('--out-dir', default='analysis/shards', help='파티션 출력 루트')
+    p.add_argument('--workers', type=int, help='최대 프로세스 수 (기본: CPU 코어 수)')
+    p.add_argument('--rpm', type=int, default=60, help='전체 요청 예산 (분당)')
+    p.add_argument('--econ', action='store_true', help='월별 경제 트렌드 키워드도 수집')
+    p.add_argument('--force', action='store_true', help='완료된 샤드도 재실행')
+    p.add_argument('--merge-only', action='store_true', help='수집 없이 병합만 실행')
+    p.set_defaults(func=cmd_shard)
+
+    p = sub.add_parser('train-classifier', help='ML 카테고리 분류기 학습')
+    p.add_argument('input', help='라벨된 도서/뉴스 CSV')
+    p.add_argument('--label-col', default='category', help='라벨 컬럼명 (예: category, 카테고리)')
+    p.add_argument('--text-cols', nargs='+', help='텍스트 역할/컬럼 (기본: title/subtitle/description/keywords, 제목/키워드도 같은 역할로 매핑)')
+    p.add_argument('--epochs', type=int, default=5, help='학습 반복 횟수')
+    p.add_argument('--model', default='analysis/correlation/category_classifier.joblib', help='분류기 저장 경로')
+    p.set_defaults(func=cmd_train_classifier)
+
+    p = sub.add_parser('classify', help='베스트셀러/뉴스 카테고리 분류')
+    p.add_argument('input', help='베스트셀러/뉴스 CSV (title 또는 제목 컬럼 필수)')
+    p.add_argument('--out', help='저장 CSV 경로 (기본: <입력>_classified.csv, 입력 파일과 같을 수 없음)')
+    p.add_argument('--method', choices=['rules', 'ml'], default='rules', help='분류 방식')
+    p.add_argument('--model', default='analysis/correlation/category_classifier.joblib', help='ML 분류기 경로')
+    p.add_argument('--threshold', type=float, default=0.0, help='ML 최소 신뢰도 (미만은 기타/미분류)')
+    p.set_defaults(func=cmd_classify)
+
+    p = sub.add_parser('correlate', help='트렌드 vs 점유율 상관분석')
+    p.add_argument('bestseller', help='베스트셀러 CSV (month, title[, category])')
+    p.add_argument('--trends', default=TRENDS_FILE, help='Google Trends CSV')
+    p.add_argument('--out-prefix', default=OUTPUT_PREFIX, help='결과 파일 접두어')
+    p.set_defaults(func=cmd_correlate)
+
+    p = sub.add_parser('xcorr', help='일별 교차상관 시차 프로파일 (0~N일)')
+    p.add_argument('leading', help='선행 일별 CSV (date, keyword, value)')
+    p.add_argument('lagging', help='후행 일별 CSV (date, category, value)')
+    p.add_argument('--max-lag', type=int, default=120, help='최대 시차 (일)')
+    p.add_argument('--x-key', default='keyword', help='선행 시계열 키 컬럼')
+    p.add_argument('--y-key', default='category', help='후행 시계열 키 컬럼')
+    p.add_argument('--geo', help='분석할 지역 코드 (geo 컬럼에 지역이 여러 개인 입력은 필수)')
+    p.add_argument('--out-prefix', default=OUTPUT_PREFIX, help='결과 파일 접두어')
+    p.set_defaults(func=cmd_xcorr)
+
+    p = sub.add_parser('events', help='바이럴 급등 이벤트 스터디 (판매 누적 초과 반응)')
+    p.add_argument('--viral', help='주간 바이럴 지수 CSV')
+    p.add_argument('--sales', help='주간 판매 점수 CSV')
+    p.add_argument('--reviews', help='주간 리뷰 신호 CSV (--response review_velocity 등에 사용)')
+    p.add_argument('--method', choices=['zscore', 'threshold'], default='zscore',
+                   help='zscore: viral_index_smoothed z-점수, threshold: viral_index 원값')
+    p.add_argument('--threshold', type=float, default=2.0, help='이벤트 기준값')
+    p.add_argument('--pre', type=int, default=4, help='기준선 구간 (주)')
+    p.add_argument('--post', type=int, default=8, help='반응 관찰 구간 (주)')
+    p.add_argument('--response', default='sales_score', help='반응 지표')
+    p.add_argument('--min-gap', type=int, help='같은 카테고리 이벤트 최소 간격 (주)')
+    p.add_argument('--out-dir', default='analysis/event_study', help='결과 저장 디렉토리')
+    p.set_defaults(func=cmd_events)
+
+    p = sub.add_parser('forecast', help='카테고리별 다음 주 판매 점수 예측')
+    p.add_argument('--viral', help='주간 바이럴 지수 CSV')
+    p.add_argument('--sales', help='주간 판매 점수 CSV')
+    p.add_argument('--out', default='analysis/prediction/weekly_sales_forecast.csv', help='예측 결과 CSV')
+    p.add_argument('--workers', type=int, help='학습 프로세스 수 (기본: CPU 코어 수)')
+    p.set_defaults(func=cmd_forecast)
+
+    p = sub.add_parser('fetch-reviews', help='리뷰/도서 상세 비동기 일괄 수집 (중단 후 재개)')
+    p.add_argument('--books', default=BOOKS_FILE, help='상품 목록 CSV (product_code, product_url)')
+    p.add_argument('--base-url', default='https://product.kyobobook.co.kr', help='API 기본 URL')
+    p.add_argument('--out-dir', default='analysis/reviews_raw', help='JSONL/커서 저장 디렉토리')
+    p.add_argument('--concurrency', type=int, default=8, help='동시 처리 상품 수 (커넥션 풀 크기)')
+    p.add_argument('--rate', type=float, default=5.0, help='호스트별 초당 요청 수')
+    p.add_argument('--max-reviews', type=int, default=300, help='도서당 최대 리뷰 수')
+    p.add_argument('--limit', type=int, help='앞에서부터 N개 상품만 수집')
+    p.add_argument('--export', help='리뷰 CSV 경로, 매번 덮어씀 (기본: kyobo_reviews_fetched.csv)')
+    p.add_argument('--standin', action='store_true', help='로컬 대체 서버를 띄워 테스트 수집')
+    p.add_argument('--standin-latency', type=float, default=0.0, help='대체 서버 요청당 지연 (초)')
+    p.set_defaults(func=cmd_fetch_reviews)
+
+    p = sub.add_parser('reviews', help='리뷰 주간 집계 (카테고리별 리뷰 속도/가중 평점/감정)')
+    p.add_argument('files', nargs='*', help='리뷰 CSV (기본: kyobo_reviews_*.csv)')
+    p.add_argument('--books', default=BOOKS_FILE, help='product_code → 카테고리 룩업용 도서 CSV (category 컬럼 필요)')
+    p.add_argument('--lookup', help='판매 CSV와 같은 카테고리의 product_code,category CSV (--books보다 우선)')
+    p.add_argument('--sales', help='카테고리/ymw 형식 기준 주간 판매 점수 CSV')
+    p.add_argument('--ymw-format', choices=['month_week', 'month_week_w', 'iso_week'],
+                   help='주차 라벨 형식 (기본: 판매 CSV 라벨에서 감지)')
+    p.add_argument('--out-dir', default='analysis/review_issues/weekly', help='집계 결과/상태 디렉토리')
+    p.add_argument('--chunk-size', type=int, default=50000, help='읽기 청크 크기')
+    p.set_defaults(func=cmd_reviews)
+
+    p = sub.add_parser('render', help='카테고리별 추이 대시보드 생성')
+    p.add_argument('--viral', help='주간 바이럴 지수 CSV')
+    p.add_argument('--sales', help='주간 판매 점수 CSV')
+    p.add_argument('--out-dir', help='HTML 저장 디렉토리')
+    p.set_defaults(func=cmd_render)
+
+    p = sub.add_parser('refresh', help='변경된 입력만 반영해 대시보드 증분 갱신')
+    p.add_argument('--viral', help='주간 바이럴 지수 CSV')
+    p.add_argument('--sales', help='주간 판매 점수 CSV')
+    p.add_argument('--books', default=BOOKS_FILE, help='리뷰 카테고리 룩업용 도서 CSV')
+    p.add_argument('--lookup', help='리뷰 카테고리 룩업 CSV (product_code,category, --books보다 우선)')
+    p.add_argument('--out-dir', help='HTML 저장 디렉토리')
+    p.add_argument('--watch', action='store_true', help='주기적으로 변경 확인')
+    p.add_argument('--interval', type=float, default=60, help='watch 확인 주기 (초)')
+    p.add_argument('--force', action='store_true', help='상태를 무시하고 전체 재생성')
+    p.set_defaults(func=cmd_refresh)
+
+    p = sub.add_parser('serve', help='로컬 대시보드 API 서버 (JSON + Plotly 프런트엔드)')
+    p.add_argument('--viral', help='주간 바이럴 지수 CSV')
+    p.add_argument('--sales', help='주간 판매 점수 CSV')
+    p.add_argument('--reviews', default='analysis/review_issues/weekly/weekly_review_signals.csv',
+                   help='주간 리뷰 신호 CSV (없으면 생략)')
+    p.add_argument('--prefix', default=OUTPUT_PREFIX, help='상관분석/인사이트 파일 접두어')
+    p.add_argument('--host', default='127.0.0.1', help='바인드 주소')
+    p.add_argument('--port', type=int, default=8050, help='포트')
+    p.add_argument('--bench', action='store_true', help='임시 포트로 로컬 부하 테스트 후 종료')
+    p.add_argument('--bench-requests', type=int, default=2000, help='부하 테스트 전체 요청 수')
+    p.add_argument('--bench-concurrency', type=int, default=32, help='부하 테스트 동시 연결 수')
+    p.set_defaults(func=cmd_serve)
+
+    p = sub.add_parser('sync', help='Supabase 테이블 → CSV 동기화')
+    p.add_argument('--table', default='books', help='Supabase 테이블명')
+    p.add_argument('--out', default=BOOKS_FILE, help='저장 CSV 경로')
+    p.set_defaults(func=cmd_sync)
+
+    p = sub.add_parser('insights', help='저장된 인사이트 출력')
+    p.add_argument('--prefix', default=OUTPUT_PREFIX, help='결과 파일 접두어')
+    p.set_defaults(func=cmd_insights)
+
+    return parser
+
+# =============================================================================
+# 3. 메인 실행 함수
+# =============================================================================
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    try:
+        return args.func(args)
+    except KeyboardInterrupt:
+        print("\n\n⚠️  사용자에 의해 중단되었습니다.")
+        return 130
+    finally:
+        if args.timing:
+            heavy = [m for m in ('pandas', 'numpy', 'scipy', 'pytrends', 'plotly') if m in sys.modules]
+            print(f"[timing] {args.command}: {time.perf_counter() - _START:.3f}s "
+                  f"(loaded: {', '.join(heavy) or 'stdlib only'})", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
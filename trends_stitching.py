@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Google Trends 일별 시계열 스티칭
+겹치는 일별 윈도우(약 90일)를 수집하고 겹침 구간 비율로 공통 스케일에 이어 붙임
+"""
+
+import os
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from new_trends_crawling import KEYWORDS_MAP
+
+# =============================================================================
+# 1. 설정
+# =============================================================================
+
+STITCH_DIR = 'analysis/trends_daily'
+RAW_WINDOWS_FILE = 'raw_windows.csv'
+DAILY_FILE = 'daily_trends.csv'
+
+# Google Trends는 약 90일 이하 기간만 일별 해상도로 반환
+WINDOW_DAYS = 90
+OVERLAP_DAYS = 30
+
+# =============================================================================
+# 2. 윈도우 계획
+# =============================================================================
+
+def plan_windows(start, end, window_days=WINDOW_DAYS, overlap_days=OVERLAP_DAYS):
+    """
+    시작일 기준으로 고정된 겹침 윈도우 목록 생성
+
+    완료된 윈도우는 실행마다 동일하므로 캐시에서 재사용되고,
+    종료일에 걸친 마지막 윈도우만 [end - window + 1, end]로 매번 새로 수집한다.
+
+    Args:
+        start: 시작일 (YYYY-MM-DD)
+        end: 종료일 (YYYY-MM-DD)
+        window_days: 윈도우 길이 (일)
+        overlap_days: 인접 윈도우 겹침 (일)
+
+    Returns:
+        list: (window_start, window_end) 문자열 튜플 리스트
+    """
+    start = pd.Timestamp(start).date()
+    end = pd.Timestamp(end).date()
+    step = timedelta(days=window_days - overlap_days)
+    length = timedelta(days=window_days - 1)
+
+    windows = []
+    ws = start
+    while ws + length <= end:
+        windows.append((ws.isoformat(), (ws + length).isoformat()))
+        ws += step
+
+    # 종료일까지 닿지 않았다면 종료일에 맞춘 열린 윈도우 추가
+    if not windows or windows[-1][1] < end.isoformat():
+        open_start = max(start, end - length)
+        windows.append((open_start.isoformat(), end.isoformat()))
+
+    return windows
+
+# =============================================================================
+# 3. 수집
+# =============================================================================
+
+def fetch_window(pytrends, keyword, window_start, window_end, geo='KR'):
+    """
+    단일 윈도우 일별 검색 지수 수집
+
+    Returns:
+        DataFrame: date, value 컬럼 (데이터 없으면 빈 데이터프레임)
+    """
+    pytrends.build_payload([keyword], timeframe=f'{window_start} {window_end}', geo=geo)
+    data = pytrends.interest_over_time()
+    if data.empty or keyword not in data.columns:
+        return pd.DataFrame(columns=['date', 'value'])
+
+    data = data[[keyword]].reset_index()
+    data.columns = ['date', 'value']
+    data['date'] = data['date'].dt.strftime('%Y-%m-%d')
+    return data
+
+# =============================================================================
+# 4. 스티칭
+# =============================================================================
+
+def stitch_windows(windows):
+    """
+    겹침 구간 합의 비율로 윈도우들을 첫 윈도우 스케일에 맞춰 연결
+
+    Args:
+        windows: 시작일 순으로 정렬된 (date 배열, value 배열) 리스트
+
+    Returns:
+        Series: 일자 인덱스의 스티칭된 값 (최대값 100으로 재정규화)
+    """
+    stitched = pd.Series(dtype=np.float64)
+
+    for dates, values in windows:
+        window = pd.Series(np.asarray(values, dtype=np.float64), index=pd.Index(dates))
+        if stitched.empty:
+            stitched = window
+            continue
+
+        overlap = window.index.intersection(stitched.index)
+        base = stitched.loc[overlap].sum()
+        new = window.loc[overlap].sum()
+        ratio = base / new if new > 0 and base > 0 else 1.0
+
+        # 겹침 구간은 기존 값 유지, 신규 일자만 스케일 조정 후 추가
+        fresh = window.index.difference(stitched.index)
+        stitched = pd.concat([stitched, window.loc[fresh] * ratio]).sort_index()
+
+    if not stitched.empty and stitched.max() > 0:
+        stitched = stitched / stitched.max() * 100
+    return stitched.round(2)
+
+
+def stitch_daily_trends(keywords=None, start='2024-01-01', end=None, geo='KR',
+                        store_dir=STITCH_DIR, window_days=WINDOW_DAYS,
+                        overlap_days=OVERLAP_DAYS, sleep_sec=2):
+    """
+    키워드별 일별 Google Trends 시계열 수집 + 스티칭 (신규 윈도우만 요청)
+
+    Args:
+        keywords: 수집할 키워드 리스트 (None이면 KEYWORDS_MAP 전체)
+        start: 시작일 (YYYY-MM-DD)
+        end: 종료일 (None이면 어제)
+        geo: 지역 코드 (KR, KR-11 등)
+        store_dir: 원본 윈도우/스티칭 결과 저장 디렉토리
+        window_days: 윈도우 길이 (일)
+        overlap_days: 인접 윈도우 겹침 (일)
+        sleep_sec: 요청 간 대기 (초)
+
+    Returns:
+        DataFrame: date, keyword, category, geo, value 컬럼
+    """
+    print("=" * 80)
+    print("Google Trends 일별 스티칭 수집 시작")
+    print("=" * 80)
+
+    from pytrends.request import TrendReq
+
+    keyword_category = {kw: cat for cat, kws in KEYWORDS_MAP.items() for kw in kws}
+    keywords = keywords or list(keyword_category)
+    end = end or (date.today() - timedelta(days=1)).isoformat()
+    windows = plan_windows(start, end, window_days, overlap_days)
+
+    os.makedirs(store_dir, exist_ok=True)
+    raw_path = os.path.join(store_dir, RAW_WINDOWS_FILE)
+    if os.path.exists(raw_path):
+        df_raw = pd.read_csv(raw_path, encoding='utf-8-sig', dtype={'date': str, 'window_start': str, 'window_end': str})
+    else:
+        df_raw = pd.DataFrame(columns=['geo', 'keyword', 'window_start', 'window_end', 'open', 'date', 'value'])
+
+    # 현재 (geo, 키워드)의 이전 실행 열린 윈도우(수집 당시 종료일에 걸친 윈도우)만 정리
+    # 다른 지역/키워드의 윈도우와 완료된 윈도우는 보존 (열린 윈도우는 해당 계획 실행 시 항상 재수집됨)
+    if 'open' not in df_raw.columns:
+        df_raw['open'] = False
+    df_raw['open'] = df_raw['open'].astype(str).str.lower().eq('true')
+    planned = pd.MultiIndex.from_tuples(windows, names=['window_start', 'window_end'])
+    window_index = pd.MultiIndex.from_frame(df_raw[['window_start', 'window_end']])
+    stale = ((df_raw['geo'] == geo) & df_raw['keyword'].isin(keywords)
+             & df_raw['open'] & ~window_index.isin(planned))
+    if stale.any():
+        print(f"\n이전 열린 윈도우 {stale.sum()}행 정리")
+    df_raw = df_raw[~stale]
+    stored = set(zip(df_raw['geo'], df_raw['keyword'], df_raw['window_start'], df_raw['window_end']))
+
+    todo = [(kw, ws, we) for kw in keywords for ws, we in windows
+            if (geo, kw, ws, we) not in stored or we == end]
+    print(f"\n윈도우 {len(windows)}개 × 키워드 {len(keywords)}개, 신규 요청 {len(todo)}건")
+
+    pytrends = TrendReq(hl='ko', tz=540, timeout=(10, 25))
+    fetched = []
+    for kw, ws, we in todo:
+        try:
+            print(f"  - '{kw}' {ws} ~ {we} 수집 중...", end=' ')
+            data = fetch_window(pytrends, kw, ws, we, geo=geo)
+            if data.empty:
+                print("✗ 데이터 없음")
+            else:
+                data = data.assign(geo=geo, keyword=kw, window_start=ws, window_end=we, open=we == end)
+                fetched.append(data)
+                print(f"✓ {len(data)}일")
+            time.sleep(sleep_sec)
+        except Exception as e:
+            print(f"✗ 오류: {str(e)[:50]}")
+            time.sleep(sleep_sec * 2)
+
+    if fetched:
+        df_new = pd.concat(fetched, ignore_index=True)
+        window_keys = ['geo', 'keyword', 'window_start', 'window_end']
+        replaced = pd.MultiIndex.from_frame(df_new[window_keys])
+        df_raw = df_raw[~pd.MultiIndex.from_frame(df_raw[window_keys]).isin(replaced)]
+        df_raw = pd.concat([df_raw, df_new[df_raw.columns]], ignore_index=True)
+    df_raw.to_csv(raw_path, index=False, encoding='utf-8-sig')
+
+    # 저장된 윈도우로 키워드별 스티칭
+    results = []
+    for (g, kw), df_kw in df_raw[df_raw['keyword'].isin(keywords)].groupby(['geo', 'keyword']):
+        if g != geo:
+            continue
+        # 이번 계획의 윈도우만 스티칭 (다른 시작일 격자의 윈도우와 섞지 않음)
+        df_kw = df_kw[pd.MultiIndex.from_frame(df_kw[['window_start', 'window_end']]).isin(planned)]
+        if df_kw.empty:
+            continue
+        kw_windows = [(grp['date'].to_numpy(), grp['value'].to_numpy())
+                      for _, grp in df_kw.sort_values(['window_start', 'date']).groupby('window_start', sort=True)]
+        stitched = stitch_windows(kw_windows)
+        results.append(pd.DataFrame({
+            'date': stitched.index, 'keyword': kw, 'category': keyword_category.get(kw, ''),
+            'geo': geo, 'value': stitched.to_numpy(),
+        }))
+
+    if not results:
+        print("\n⚠️  스티칭할 데이터 없음")
+        return pd.DataFrame()
+
+    df_daily = pd.concat(results, ignore_index=True)
+    daily_path = os.path.join(store_dir, DAILY_FILE)
+    if os.path.exists(daily_path):
+        # 다른 지역/키워드 결과는 유지
+        df_prev = pd.read_csv(daily_path, encoding='utf-8-sig', dtype={'date': str})
+        df_prev = df_prev[~(df_prev['geo'].eq(geo) & df_prev['keyword'].isin(keywords))]
+        df_daily = pd.concat([df_prev, df_daily], ignore_index=True)
+    df_daily.to_csv(daily_path, index=False, encoding='utf-8-sig')
+
+    print(f"\n{'=' * 80}")
+    print(f"스티칭 완료: {df_daily['keyword'].nunique()}개 키워드, {df_daily['date'].nunique()}일")
+    print(f"✓ 저장: {daily_path}")
+    print(f"{'=' * 80}")
+
+    return df_daily
+
+
+if __name__ == "__main__":
+    stitch_daily_trends()